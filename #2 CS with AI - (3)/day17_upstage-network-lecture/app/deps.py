@@ -1,12 +1,12 @@
-from fastapi.params import Depends
-
 from app.repository.user_repo import UserRepository
 from app.service.user_service import UserService
 
+# 요청마다 객체를 만들지 않도록 앱 전체에서 하나의 인스턴스를 공유
 user_repo = UserRepository()
+user_service = UserService(user_repo=user_repo)
 
 def get_user_repository() -> UserRepository:
     return user_repo
 
-def get_user_service(user_repo: UserRepository = Depends(get_user_repository)) -> UserService:
-    return UserService(user_repo=user_repo)
+def get_user_service() -> UserService:
+    return user_service
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
 
 
 class UserCreateRequest(BaseModel):
@@ -7,7 +9,10 @@ class UserCreateRequest(BaseModel):
 
 
 class UserResponse(BaseModel):
+    # User 엔티티(dataclass)의 속성에서 바로 응답 생성
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     email: str
-    created_at: str
\ No newline at end of file
+    created_at: datetime
\ No newline at end of file
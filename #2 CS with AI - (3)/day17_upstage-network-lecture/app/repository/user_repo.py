@@ -7,6 +7,7 @@ from app.models.entities import User
 class UserRepository:
     def __init__(self):
         self._users_memory_db: Dict[str, User] = {}
+        self._users_by_email: Dict[str, User] = {}
         self._next_id = 1
 
     def save(self, name: str, email: str) -> User:
@@ -17,6 +18,7 @@ class UserRepository:
             created_at=datetime.now()
         )
         self._users_memory_db[self._next_id] = user
+        self._users_by_email[email.strip().lower()] = user
         self._next_id += 1
         return user
 
@@ -24,16 +26,14 @@ class UserRepository:
         return self._users_memory_db.get(user_id)
 
     def find_by_email(self, email: str) -> Optional[User]:
-        for user in self._users_memory_db.values():
-            if user.email == email:
-                return user
-        return None
+        return self._users_by_email.get(email.strip().lower())
 
     def find_all(self) -> List[User]:
         return list(self._users_memory_db.values())
 
     def delete(self, user_id: int) -> bool:
-        if user_id in self._users_memory_db:
-            del self._users_memory_db[user_id]
+        user = self._users_memory_db.pop(user_id, None)
+        if user is not None:
+            self._users_by_email.pop(user.email.strip().lower(), None)
             return True
         return False
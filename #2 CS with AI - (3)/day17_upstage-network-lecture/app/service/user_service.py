@@ -1,17 +1,29 @@
-from typing import Dict, Any
-from app.exceptions import EmailNotAllowedNameExistsError
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+
+from app.exceptions import EmailNotAllowedNameExistsError, UserNotFoundError
+from app.models.entities import User
 
 from app.repository.user_repo import UserRepository
 
+# 조회 결과가 없는 경우도 캐싱 (반복되는 404 요청이 repository까지 가지 않도록)
+_NOT_FOUND = object()
+
 
 class UserService:
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
+        # 10분 TTL 캐시 (User 엔티티를 그대로 저장)
+        self._user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=600)
+        self._email_cache: TTLCache = TTLCache(maxsize=10_000, ttl=600)
+        self._cache_lock = threading.Lock()
 
     def _valid_email(self, email: str) -> bool:
         return True
 
-    def create_user(self, name: str, email: str) -> Dict[str, Any]:
+    def create_user(self, name: str, email: str) -> User:
         if not self._valid_email(email):
             raise ValueError("Invalid email format")
         if email == "admin@example.com":
@@ -19,11 +31,45 @@ class UserService:
         # save 추가
         user = self.user_repo.save(name=name, email=email)
 
-        return  {'id': user.id, 'name': user.name,
-                'email': user.email, 'created_at': str(user.created_at)}
+        # 새로 생성된 사용자에 대한 (negative) 캐시 무효화
+        with self._cache_lock:
+            self._user_cache.pop(user.id, None)
+            self._email_cache.pop(email.strip().lower(), None)
+
+        return user
+
 
+    def get_user(self, user_id: int) -> User:
+        with self._cache_lock:
+            cached = self._user_cache.get(user_id)
+        if cached is None:
+            user = self.user_repo.find_by_id(user_id=user_id)
+            cached = user if user is not None else _NOT_FOUND
+            with self._cache_lock:
+                self._user_cache[user_id] = cached
 
-    def get_user(self, user_id: int) -> Dict[str, Any]:
+        if cached is _NOT_FOUND:
+            raise UserNotFoundError(user_id)
+        return cached
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        key = email.strip().lower()
+        with self._cache_lock:
+            cached = self._email_cache.get(key)
+        if cached is None:
+            user = self.user_repo.find_by_email(email=key)
+            cached = user if user is not None else _NOT_FOUND
+            with self._cache_lock:
+                self._email_cache[key] = cached
+
+        return None if cached is _NOT_FOUND else cached
+
+    def delete_user(self, user_id: int) -> None:
         user = self.user_repo.find_by_id(user_id=user_id)
-        return {'id': user.id, 'name': user.name,
-                'email': user.email, 'created_at': str(user.created_at)}
+        if user is None or not self.user_repo.delete(user_id=user_id):
+            raise UserNotFoundError(user_id)
+
+        # 삭제된 사용자가 캐시에서 계속 조회되지 않도록 무효화
+        with self._cache_lock:
+            self._user_cache.pop(user_id, None)
+            self._email_cache.pop(user.email.strip().lower(), None)
@@ -5,21 +5,24 @@ LangGraph 에이전틀르 호출하여 사용자 메시지를 처리합니다.
 
 from typing import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
-from langchain_core.messages import HumanMessage, BaseMessage, AIMessage, AIMessageChunk
+from langchain_core.messages import HumanMessage, AIMessageChunk
 from loguru import logger
 
-from app.schemas.chat import ChatRequest, ChatResponse, StreamEvent
+from app.schemas.chat import ChatRequest, ChatResponse, StreamEvent, format_token_sse
 from app.graph import get_lumi_graph
 
 router = APIRouter()
 
-# In-memory 세션 저장소
-# 서버 메모리에 세션별 대화 히스토리를 저장
-# 장점 : 빠른 접근 속도, 구현 간단
+# 세션별 대화 히스토리는 LangGraph 체크포인터가 관리
+# config의 thread_id(= session_id)로 이전 State를 불러와서 새 메시지를 이어붙임
 
-SESSION_STORE: dict[str, list[BaseMessage]] = {}
+
+def _thread_config(session_id: str) -> dict:
+    """세션 ID로 체크포인터 thread 설정을 생성"""
+    return {"configurable": {"thread_id": session_id}}
 
 @router.post("/", response_model=ChatResponse) # api/v1/chat
 async def chat(request: ChatRequest) -> ChatResponse:
@@ -47,7 +50,9 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
         # Step 3 : 그래프 실행
         logger.debug("LangGraph 실행 시작")
-        final_state = await graph.ainvoke(initial_state)
+        final_state = await graph.ainvoke(
+            initial_state, config=_thread_config(request.session_id)
+        )
         logger.debug("LangGraph 실행 완료")
 
         # Step 4 : 최종 응답 추출
@@ -76,6 +81,21 @@ async def chat(request: ChatRequest) -> ChatResponse:
 # WebSocket과 달리 단방향이지만, HTTP/1.1 위에서 동작해서 구현이 간단
 # 형식 : "data: {JSON}\n\n" 형태로 이벤트를 발송
 
+# 노드 이름 -> 사용자 친화적 메시지
+NODE_STATUS = {
+    "router": "루미 생각 중...",
+    "rag": "정보 검색 중...",
+    "tool": "도구 실행 중...",
+    "response": "응답 작성 중..."
+}
+
+# 내용이 고정된 이벤트는 모듈 로드 시 SSE bytes로 미리 만들어 둠
+_THINKING_EVENTS: dict[str, bytes] = {
+    status: b"data: " + orjson.dumps({"type": "thinking", "content": status}) + b"\n\n"
+    for status in NODE_STATUS.values()
+}
+_DONE_EVENT = b'data: {"type":"done"}\n\n'
+
 # SSE 스트리밍을 위한 Helper 함수
 async def stream_with_status(
         message: str,
@@ -101,11 +121,11 @@ async def stream_with_status(
     graph = get_lumi_graph()
 
     session_id = session_id or "default"
-    history = SESSION_STORE.get(session_id, [])
     new_message = HumanMessage(content=message)
 
+    # 이전 대화는 체크포인터가 불러오므로 새 메시지만 전달 (add_messages 리듀서가 병합)
     initial_state = {
-        "messages": history + [new_message],
+        "messages": [new_message],
         "intent": None,
         "retrieved_docs": [],
         "tool_name": None,
@@ -115,29 +135,24 @@ async def stream_with_status(
         "user_id": user_id
     }
 
-    logger.debug(f"[StreanWithStatus] 세션 히스토리: {len(history)}개 메시지")
-
     final_response = ""
     final_tool_name = None
     current_node = None
 
-    # 노드 이름 -> 사용자 친화적 메시지
-    node_status = {
-        "router": "루미 생각 중...",
-        "rag": "정보 검색 중...",
-        "tool": "도구 실행 중...",
-        "response": "응답 작성 중..."
-    }
-
-    async for mode, event in graph.astream(initial_state, stream_mode=["updates", "messages"]):
+    async for mode, event in graph.astream(
+        initial_state,
+        config=_thread_config(session_id),
+        stream_mode=["updates", "messages"],
+    ):
         # stream_mode = updates -> 노드 스트리밍, 노드가 완료될 때마다 이벤트를 발생
         if mode == "updates":
             # event = {"router": {"next": "tool"}}
             for node_name, node_output in event.items():
-                # 새로운 노드에 진입했는가?
-                if node_name != current_node and node_name in node_status:
+                # 새로운 노드에 진입했는가? (in + [] 대신 get 한 번으로 조회)
+                status = NODE_STATUS.get(node_name)
+                if node_name != current_node and status:
                     current_node = node_name
-                    yield (node_status[node_name], None, None, None)
+                    yield (status, None, None, None)
                     logger.debug(f"[StreamWithStatus] 노드 진입: {node_name}")
                 
                 # tool 노드에서 tool_name 추출
@@ -162,15 +177,6 @@ async def stream_with_status(
                     final_response += token
                     yield (None, token, None, None)
 
-    # 세션 히스토리에 저장
-    if final_response:
-        # (None, None, "안녕하세요 오늘 일정은..", None)
-        if session_id not in SESSION_STORE:
-            SESSION_STORE[session_id] = []
-        SESSION_STORE[session_id].append(new_message)
-        SESSION_STORE[session_id].append(AIMessage(content=final_response))
-        logger.debug([f"[StreamWithStauts] 세션 저장: {session_id}"])
-
     yield (None, None, final_response, final_tool_name)
 
 # SSE 스트리밍 엔드포인트 구현
@@ -181,7 +187,7 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
     """
     logger.info(f"[Stream] 노드 + 토큰 스트리밍 요청: session={request.session_id}")
 
-    async def generate() -> AsyncGenerator[str, None]:
+    async def generate() -> AsyncGenerator[bytes, None]:
         # SSE 이벤트 생성기 : 노드 상태 + 토큰 스트리밍
         try:
             async for status, token, final, tool_used in stream_with_status(
@@ -191,22 +197,22 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
             ):
                 # 노드 상태(thinking 이벤트)
                 if status:
-                    yield StreamEvent(type="thinking", content=status).to_sse()
+                    yield _THINKING_EVENTS[status]
                 
                 # 토큰 스트리밍
                 if token:
-                    yield StreamEvent(type="token", content=token).to_sse()
+                    yield format_token_sse(token)
                 
                 if final:
                     yield StreamEvent(type="response", content=final, tool_used=tool_used).to_sse()
                 
-            yield StreamEvent(type="done").to_sse()
+            yield _DONE_EVENT
             logger.info(f"[Stream] 완료: session={request.session_id}")
 
         except Exception as e:
             logger.error(f"[Stream] 오류: {e}")
             yield StreamEvent(type="error", error=str(e)).to_sse()
-            yield StreamEvent(type="done").to_sse()
+            yield _DONE_EVENT
 
     return StreamingResponse(
         generate(),
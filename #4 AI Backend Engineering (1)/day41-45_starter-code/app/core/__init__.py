@@ -6,6 +6,8 @@
 
 모듈:
     - config.py: 환경변수 설정 관리
+    - batching.py: 호출을 모아 abatch로 보내는 BatchingClient
+      (그래프/Supabase를 import하지 않으므로 data/scripts에서도 부작용 없이 사용 가능)
 """
 
 from app.core.config import settings
@@ -0,0 +1,130 @@
+"""
+LLM 호출 배치 처리
+
+동시에 들어온 여러 요청의 LLM 호출을 큐에 모았다가
+abatch()로 한 번에 보내는 래퍼입니다.
+
+- 배치가 가득 차거나(max_batch_size) 대기 시간(max_wait_ms)이 지나면 전송
+- 전송은 별도 Task로 실행하고 동시에 최대 max_concurrency개 배치까지 진행
+  (응답을 기다리는 동안에도 워커는 다음 배치를 모음)
+- 각 요청은 자신의 Future가 완료될 때까지 기다림
+- 워커는 빈 contextvars 컨텍스트에서 실행하고, 각 요청의 config(callbacks/태그/메타데이터)는
+  ainvoke 시점에 캡처해서 abatch(config=[...])로 항목별로 넘김
+  (워커가 첫 요청의 컨텍스트를 물려받으면 이후 모든 배치가 첫 요청의 callbacks로 실행됨)
+
+참고: ChatUpstage 등 채팅 모델의 abatch는 기본 구현(ainvoke를 동시에 실행)이라
+HTTP 요청 수는 줄지 않습니다. 배치 API를 지원하는 대상(임베딩 등)에서 효과가 있습니다.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Protocol
+
+from langchain_core.runnables import RunnableConfig, ensure_config
+from loguru import logger
+
+
+class SupportsABatch(Protocol):
+    """abatch(inputs, config=[...], return_exceptions=True)를 지원하는 객체 (LangChain Runnable 등)"""
+
+    async def abatch(
+        self,
+        inputs: list[Any],
+        config: list[RunnableConfig] | None = None,
+        *,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        ...
+
+
+class BatchingClient:
+    """
+    Runnable의 ainvoke 호출을 모아서 abatch로 실행하는 클라이언트
+
+    abatch만 있으면 되므로 Runnable이 아닌 객체도 감쌀 수 있습니다.
+    (예: data/scripts/ingest_rag.py의 임베딩 배치)
+
+    Example:
+        >>> client = BatchingClient(llm.with_structured_output(RouterOutput))
+        >>> result = await client.ainvoke(messages)
+    """
+
+    def __init__(
+        self,
+        runnable: SupportsABatch,
+        max_batch_size: int = 8,
+        max_wait_ms: int = 50,
+        max_concurrency: int = 4,
+    ):
+        self.runnable = runnable
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self.max_concurrency = max(1, max_concurrency)
+
+        # 큐/워커/Semaphore는 실행 중인 이벤트 루프에 묶이므로 첫 호출 시 생성
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        # 실행 중인 전송 Task (참조를 유지하지 않으면 GC로 사라질 수 있음)
+        self._inflight: set[asyncio.Task] = set()
+
+    async def ainvoke(self, input: Any) -> Any:
+        """요청을 큐에 넣고 배치 실행 결과를 기다립니다."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        # 호출한 쪽(LangGraph 노드)의 config를 지금 캡처해서 배치 실행 시 그대로 사용
+        await self._queue.put((input, ensure_config(), future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            # 워커는 오래 살아있으므로 첫 요청의 contextvars(실행 config 등)를 물려받지 않게 빈 컨텍스트로 시작
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+
+            # 배치가 가득 차거나 대기 시간이 끝날 때까지 모으기
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            # 전송 중인 배치가 max_concurrency개면 자리가 날 때까지 대기
+            # (그동안 새 요청은 큐에 쌓여서 다음 배치가 됨)
+            await self._semaphore.acquire()
+            task = self._loop.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: list[tuple[Any, RunnableConfig, asyncio.Future]]) -> None:
+        logger.debug(f"[BatchingClient] 배치 실행: {len(batch)}개 요청")
+        inputs = [item for item, _, _ in batch]
+        configs = [config for _, config, _ in batch]
+
+        try:
+            results = await self.runnable.abatch(inputs, config=configs, return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            self._semaphore.release()
+
+        for (_, _, future), result in zip(batch, results):
+            # 요청이 이미 취소된 경우는 건너뜀
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
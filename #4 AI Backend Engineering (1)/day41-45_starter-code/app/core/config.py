@@ -45,6 +45,23 @@ class Settings(BaseSettings):
     # Upstage Solar 모델: solar-pro, solar-mini
     llm_model: str = "solar-pro2"
 
+    # 동시 요청의 Router LLM 호출을 묶어서 보내는 배치 설정
+    # 최대 배치 크기 / 배치를 채우기 위해 기다리는 최대 시간(ms)
+    llm_batch_size: int = 8
+    llm_batch_wait_ms: int = 50
+    # 동시에 응답을 기다릴 수 있는 배치 수 (한 배치가 LLM 응답을 기다리는 동안 다음 배치도 전송)
+    llm_batch_concurrency: int = 4
+
+    # 쿼리 임베딩 디스크 캐시(SQLite) 파일 경로
+    # 서버 재시작/reload 후에도 이미 본 쿼리는 임베딩 API를 다시 호출하지 않음 (빈 값이면 사용 안 함)
+    embedding_cache_path: str = ".cache/embeddings.sqlite3"
+    # 디스크 캐시 최대 항목 수 (넘으면 오래된 항목부터 삭제, 4096차원 int8 기준 항목당 약 4KB)
+    embedding_cache_max_entries: int = 20000
+
+    # 서버 시작 시 그래프를 한 번 실행해서 첫 요청의 지연을 줄일지 여부
+    # (실제 LLM을 호출하므로 API 비용이 발생함)
+    warmup_on_startup: bool = False
+
     # ===== 데이터베이스 설정 =====
     # Supabase 프로젝트 URL
     supabase_url: str = ""
@@ -59,6 +76,16 @@ class Settings(BaseSettings):
     # 서버 포트
     port: int = 8000
 
+    # uvicorn 워커 프로세스 수 (debug=True면 reload를 위해 1개로 실행)
+    # 세션 히스토리가 MemorySaver(프로세스 메모리)에 있으므로
+    # 2 이상으로 올리려면 Redis/Postgres 체크포인터로 먼저 교체해야 함
+    workers: int = 1
+
+    # 세션 히스토리(체크포인트) 보관 설정
+    # 마지막 대화 후 이 시간(초)이 지난 세션은 삭제 / 보관할 최대 세션 수 (넘으면 오래된 세션부터 삭제)
+    session_ttl_seconds: int = 3600
+    max_sessions: int = 1000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -6,6 +6,7 @@ state.py : 에이전트 상태 정의
 nodes.py : 그래프 노드
 edges.py : 조건부 라우팅
 graph.py : 그래프 조합 및 컴파일
+checkpointer.py : 오래된 세션을 정리하는 인메모리 체크포인터
 
 """
 
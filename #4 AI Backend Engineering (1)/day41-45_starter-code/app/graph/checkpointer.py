@@ -0,0 +1,112 @@
+"""
+thread별 체크포인트 수, 세션 수, 유휴 시간에 상한이 있는 인메모리 체크포인터
+
+MemorySaver는 thread_id(= session_id)별 체크포인트를 프로세스가 끝날 때까지
+계속 쌓아 두므로, 서버를 오래 띄워 두면 메모리가 끝없이 늘어납니다.
+BoundedMemorySaver는 저장할 때마다 다음을 정리합니다.
+
+- thread마다 최신 체크포인트 하나만 유지
+  (MemorySaver는 superstep마다 체크포인트와 messages blob 버전을 새로 쌓으므로,
+  State의 messages를 잘라도 활성 세션 하나가 계속 커짐)
+- ttl_seconds 동안 저장이 없었던 thread는 삭제 (대화가 끊긴 세션)
+- thread 수가 max_sessions를 넘으면 가장 오래 쓰지 않은 thread부터 삭제
+
+삭제된 세션으로 다시 요청하면 히스토리 없이 새 대화로 시작합니다.
+지난 체크포인트를 지우므로 get_state_history/time travel은 최신 상태만 보여줍니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata
+from langgraph.checkpoint.memory import MemorySaver
+from loguru import logger
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    지난 체크포인트와 오래된 thread를 정리하는 MemorySaver
+
+    aput/adelete_thread는 MemorySaver 구현이 put/delete_thread를 그대로 호출하므로
+    동기 메서드만 오버라이드하면 됩니다.
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_sessions: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max(1, max_sessions)
+        # thread_id -> 마지막 저장 시각 (오래된 순서로 정렬된 상태 유지)
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        # thread_id -> checkpoint_ns -> 최신 체크포인트의 channel_versions (지난 blob 삭제용)
+        self._channel_versions: dict[str, dict[str, ChannelVersions]] = {}
+        # 동기 그래프 실행은 스레드풀에서 돌 수 있으므로 락으로 보호
+        self._lock = threading.Lock()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        self._drop_old_checkpoints(
+            thread_id, config["configurable"].get("checkpoint_ns", ""), checkpoint
+        )
+        self._touch(thread_id)
+        return result
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._last_access.pop(thread_id, None)
+            self._channel_versions.pop(thread_id, None)
+            super().delete_thread(thread_id)
+
+    def _drop_old_checkpoints(self, thread_id: str, checkpoint_ns: str, checkpoint: Checkpoint) -> None:
+        """방금 저장한 체크포인트만 남기고 같은 thread/ns의 지난 체크포인트, writes, blob을 삭제"""
+        latest_id = checkpoint["id"]
+        versions = dict(checkpoint["channel_versions"])
+
+        with self._lock:
+            checkpoints = self.storage[thread_id][checkpoint_ns]
+            for checkpoint_id in [cid for cid in checkpoints if cid != latest_id]:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+            # 이전 체크포인트가 참조하던 blob 중 최신 체크포인트가 참조하지 않는 버전 삭제
+            thread_versions = self._channel_versions.setdefault(thread_id, {})
+            previous = thread_versions.get(checkpoint_ns, {})
+            for channel, version in previous.items():
+                if versions.get(channel) != version:
+                    self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+            thread_versions[checkpoint_ns] = versions
+
+    def _touch(self, thread_id: str) -> None:
+        """thread의 저장 시각을 갱신하고 TTL/최대 세션 수를 넘은 thread를 삭제"""
+        now = time.monotonic()
+
+        with self._lock:
+            self._last_access[thread_id] = now
+            self._last_access.move_to_end(thread_id)
+
+            # 앞쪽이 가장 오래된 thread이므로, 조건을 만족하지 않는 첫 thread에서 멈춤
+            expired = []
+            for old_id, last in self._last_access.items():
+                if old_id == thread_id:
+                    break
+                over_limit = len(self._last_access) - len(expired) > self.max_sessions
+                if not over_limit and now - last <= self.ttl_seconds:
+                    break
+                expired.append(old_id)
+
+            for old_id in expired:
+                del self._last_access[old_id]
+                self._channel_versions.pop(old_id, None)
+                super().delete_thread(old_id)
+
+        if expired:
+            logger.debug(f"오래된 세션 체크포인트 {len(expired)}개 삭제")
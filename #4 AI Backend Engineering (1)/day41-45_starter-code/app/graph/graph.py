@@ -7,6 +7,8 @@ LangGraph 그래프 구성
 from langgraph.graph import StateGraph, START, END
 from loguru import logger
 
+from app.core.config import settings
+from app.graph.checkpointer import BoundedMemorySaver
 from app.graph.edges import route_by_intent
 from app.graph.nodes import router_node, rag_node, tool_node, response_node
 from app.graph.state import LumiState
@@ -39,7 +41,14 @@ def create_lumi_graph() -> StateGraph:
     builder.add_edge("response", END)
 
     # 컴파일
-    compiled = builder.compile()
+    # 체크포인터 : thread_id(= session_id)별로 State를 저장해서 대화 히스토리를 유지
+    # MemorySaver는 프로세스 메모리에 저장 (여러 워커/서버에서 공유하려면 Redis/Postgres 체크포인터 사용)
+    # 세션이 끝없이 쌓이지 않도록 TTL/최대 세션 수를 넘은 thread는 삭제하는 BoundedMemorySaver 사용
+    checkpointer = BoundedMemorySaver(
+        ttl_seconds=settings.session_ttl_seconds,
+        max_sessions=settings.max_sessions,
+    )
+    compiled = builder.compile(checkpointer=checkpointer)
 
     return compiled
 
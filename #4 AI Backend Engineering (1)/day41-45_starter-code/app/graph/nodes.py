@@ -1,19 +1,22 @@
 # router -> rag -> tool
 
-import json
+import re
+from functools import lru_cache
 
+import orjson
 from pydantic import BaseModel, Field
 from langchain_upstage import ChatUpstage
-from datetime import datetime
+from datetime import date
 from typing import Literal
 from loguru import logger
 
 from app.core.prompts import RESPONSE_PROMPT, ROUTER_PROMPT, RAG_RESPONCE_PROMPT
 from app.core.config import settings
-from app.graph.state import LumiState
+from app.core.batching import BatchingClient
+from app.graph.state import LumiState, MAX_HISTORY_MESSAGES
 from app.repositories.rag import get_rag_repository
 from app.tools.executor import ToolExecutor
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, RemoveMessage
 
 class RouterOutput(BaseModel):
     """
@@ -34,9 +37,13 @@ class RouterOutput(BaseModel):
     )
 
 
+@lru_cache
 def get_llm() -> ChatUpstage:
     """
-    Upstage Solar LLM 클라이언트를 반환
+    Upstage Solar LLM 클라이언트를 반환 (싱글톤 패턴)
+
+    요청마다 클라이언트를 새로 만들면 HTTP 커넥션 풀도 매번 새로 만들어지므로
+    lru_cache로 한 번만 생성하고 재사용합니다.
     """
     return ChatUpstage (
         api_key=settings.upstage_api_key,
@@ -45,21 +52,60 @@ def get_llm() -> ChatUpstage:
         max_retries=2
 )
 
+@lru_cache
+def get_router_llm() -> BatchingClient:
+    """
+    Router용 structured output LLM을 반환 (싱글톤 패턴)
+
+    동시에 들어온 요청의 라우팅 호출을 BatchingClient로 묶어서 보냅니다.
+    response 노드는 토큰 스트리밍이 필요하므로 배치하지 않습니다.
+    """
+    return BatchingClient(
+        get_llm().with_structured_output(RouterOutput),
+        max_batch_size=settings.llm_batch_size,
+        max_wait_ms=settings.llm_batch_wait_ms,
+        max_concurrency=settings.llm_batch_concurrency,
+    )
+
 tool_executor = ToolExecutor()
 
+# router_node에서 tool_name 정리에 사용 (모듈 로드 시 한 번만 생성)
+_QUOTE_TRANSLATE = str.maketrans("", "", "'\"`‘’“”「」『』")
+_TOOL_SPLIT_RE = re.compile(r"[,?]")
+
+# 유효한 Tool 이름만 나오는지 화이트리스트
+_VALID_TOOLS: frozenset[str] = frozenset(
+    {"get_schedule", "send_fan_letter", "recommend_song", "get_weather"}
+)
+
+# 오늘 날짜 문자열 + 라우터 프롬프트 캐시 (날짜가 바뀔 때만 다시 생성)
+# ROUTER_PROMPT에는 JSON 예시의 {}가 있어서 str.format 템플릿 대신 날짜별로 통째로 캐싱
+_ROUTER_PROMPT_BODY = f"\n\n{ROUTER_PROMPT}"
+_date_cache: dict = {"day": None, "str": "", "router_prompt": ""}
+
+def _refresh_date_cache() -> None:
+    today = date.today()
+    if today != _date_cache["day"]:
+        _date_cache["day"] = today
+        _date_cache["str"] = today.isoformat()
+        _date_cache["router_prompt"] = "오늘 날짜: " + _date_cache["str"] + _ROUTER_PROMPT_BODY
+
+def _router_prompt() -> str:
+    """오늘 날짜가 포함된 라우터 프롬프트를 반환"""
+    _refresh_date_cache()
+    return _date_cache["router_prompt"]
+
 async def router_node(state: LumiState) -> dict:
     """사용자 의도 분류"""
     logger.info("[Router] 의도 분류 시작")
     last_message = state["messages"][-1]
     user_input = last_message.content
 
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(RouterOutput)
-    current_date = datetime.now().strftime("%Y-%m-%d")
+    structured_llm = get_router_llm()
 
     messages = [
-        HumanMessage(content=f"오늘 날짜: {current_date}\n\n{ROUTER_PROMPT}"),
-        HumanMessage(content=f"사용자: {user_input}"),
+        HumanMessage(content=_router_prompt()),
+        HumanMessage(content="사용자: " + user_input),
     ]
 
     try:
@@ -78,21 +124,12 @@ async def router_node(state: LumiState) -> dict:
                 tool_name = None
             else:
                 # 따옴표를 제거 -> 유니코드 따옴표
-                tool_name = tool_name.strip()
-                quote_chars = "'\"`'''\"\"「」『』"
-                tool_name = tool_name.strip(quote_chars)
-                for char in quote_chars:
-                    tool_name = tool_name.replace(char, "")
-                
-                # 쉼표로 나열된 경우 첫 번째만  사용
-                if "," in tool_name:
-                    tool_name = tool_name.split(",")[0].strip()
-                #tool1?tool2?tool3
-                if "?" in tool_name:
-                    tool_name = tool_name.split("?")[0].strip()
-
-        # 유효한 Tool 이름만 나오는지 화이트리스트
-        valid_tools = ["get_schedule", "send_fan_letter", "recommend_song", "get_weather"]
+                # translate 한 번으로 모든 따옴표를 제거 (replace 반복 X)
+                tool_name = tool_name.strip().translate(_QUOTE_TRANSLATE)
+
+                # 쉼표/물음표로 나열된 경우 첫 번째만 사용
+                # "tool1, tool2" / "tool1?tool2?tool3"
+                tool_name = _TOOL_SPLIT_RE.split(tool_name, maxsplit=1)[0].strip()
 
         result_intent = result.intent
 
@@ -100,7 +137,7 @@ async def router_node(state: LumiState) -> dict:
             if not tool_name:
                 logger.warning("intent=tool인데 tool_name이 없음, chat으로 전환")
                 result_intent = "chat"
-            elif tool_name not in valid_tools:
+            elif tool_name not in _VALID_TOOLS:
                 logger.warning(f"유효하지 않은 Tool: {tool_name}, chat으로 전환")
                 tool_name = None
                 result_intent = "chat"
@@ -183,6 +220,9 @@ async def tool_node(state: LumiState) -> dict:
         "tool_result": result
     }
 
+# 히스토리 메시지 타입 -> 화자 이름 (그 외 타입은 "루미")
+_HISTORY_ROLES: dict[type, str] = {HumanMessage: "사용자"}
+
 async def response_node(state: LumiState) -> dict:
     """
     최종 응답 생성
@@ -203,10 +243,12 @@ async def response_node(state: LumiState) -> dict:
     elif intent == "tool":
         tool_result = state["tool_result"]
         tool_name = state["tool_name"]
+        # LLM은 들여쓰기가 필요 없으므로 compact JSON으로 (토큰 수도 절약)
+        tool_result_json = orjson.dumps(tool_result).decode("utf-8")
 
         result_context = f"""
         ## 조회 결과 (내부 참고용, 절대 그대로 출력하지 마!)
-        tool_name : {tool_name}, tool_result : {json.dumps(tool_result, ensure_ascii=False, indent=2)}
+        tool_name : {tool_name}, tool_result : {tool_result_json}
         
         ## 규칙
         - 위 결과를 바탕으로 루미답게 친근하게 안내해줘
@@ -220,15 +262,15 @@ async def response_node(state: LumiState) -> dict:
         system_prompt = RESPONSE_PROMPT
 
     # 대화 히스토리 관리, 과거 대화를 전달하면 맥락을 이해하면 좋겠음
-    history_messages = state["messages"][:-1][-6:] if len(state["messages"]) > 1 else []
+    # 현재 메시지를 제외한 최근 6개만 한 번의 슬라이싱으로 가져옴 (전체 복사 X)
+    history_messages = state["messages"][-7:-1]
     
     history_text = ""
     if history_messages:
-        history_parts = []
-        for msg in history_messages:
-            role = "사용자" if isinstance(msg, HumanMessage) else "루미"
-            history_parts.append(f"{role}: {msg.content}")
-        history_text = "\n".join(history_parts)
+        history_text = "\n".join(
+            f"{_HISTORY_ROLES.get(type(msg), '루미')}: {msg.content}"
+            for msg in history_messages
+        )
         history_text = f"\n\n ## 이전 대화: \n{history_text}\n"
     
     messages = [
@@ -236,8 +278,12 @@ async def response_node(state: LumiState) -> dict:
         HumanMessage(content=f"사용자: {user_input}"),
     ]
 
+    # 체크포인터에 저장되는 히스토리가 계속 늘어나지 않도록 오래된 메시지 삭제
+    overflow = len(state["messages"]) + 1 - MAX_HISTORY_MESSAGES
+    removals = [RemoveMessage(id=msg.id) for msg in state["messages"][:overflow]] if overflow > 0 else []
+
     try:
         response = await llm.ainvoke(messages)
-        return {"messages": [AIMessage(content=response.content)]}
+        return {"messages": [*removals, AIMessage(content=response.content)]}
     except Exception as e:
-        return {"messages": [AIMessage(content=f"미안, 오류가 생겼어! 다시 말해줄래? ({e})")]}
\ No newline at end of file
+        return {"messages": [*removals, AIMessage(content=f"미안, 오류가 생겼어! 다시 말해줄래? ({e})")]}
\ No newline at end of file
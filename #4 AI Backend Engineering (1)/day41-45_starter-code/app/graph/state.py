@@ -2,6 +2,9 @@ from typing import TypedDict, Literal, Annotated
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
+# 세션(thread)당 체크포인터에 보관하는 최대 메시지 수 (사용자 6 + 루미 6)
+MAX_HISTORY_MESSAGES = 12
+
 
 class LumiState(TypedDict):
     messages: Annotated[list[BaseMessage], add_messages]
@@ -26,10 +26,14 @@ from fastapi.middleware.cors import CORSMiddleware
 import sys
 
 import gradio as gr
+from langchain_core.messages import HumanMessage
 from loguru import logger
 from app.core.config import settings
 from app.api.routes import api_router
 from app.graph import get_lumi_graph
+from app.graph.nodes import get_llm, tool_executor
+from app.graph.state import create_initial_state
+from app.repositories.rag import get_rag_repository
 from app.ui import create_demo
 
 logger.remove() 
@@ -53,9 +57,11 @@ async def lifespan(app: FastAPI):
         - 데이터베이스 연결 설정
         - 캐시 연결 설정
         - LangGraph 그래프 컴파일
+        - LLM / RAG 클라이언트 초기화 (+ 선택적으로 그래프 warmup)
 
     종료 시 (yield 이후):
         - 연결 정리
+        - 백그라운드 팬레터 저장 큐 비우기
         - 리소스 해제
 
     Args:
@@ -70,18 +76,58 @@ async def lifespan(app: FastAPI):
 
     _validate_settings()
 
+    # 첫 요청에서 초기화 비용을 내지 않도록 시작 시점에 미리 생성 (cold start 방지)
     try:
-        from app.graph import get_lumi_graph
         graph = get_lumi_graph()
         logger.info("LangGraph 그래프 컴파일 완료")
     except Exception as e:
-        logger.error(f"LangGraph 초기화 실패")
+        logger.error(f"LangGraph 초기화 실패: {e}")
+        graph = None
+
+    try:
+        get_llm()
+        get_rag_repository()
+        logger.info("LLM / RAG 클라이언트 초기화 완료")
+    except Exception as e:
+        logger.warning(f"클라이언트 사전 초기화 실패: {e}")
+
+    if graph is not None and settings.warmup_on_startup:
+        await _warmup_graph(graph)
 
     yield  # 이 지점에서 서버가 요청을 처리함
 
     # ===== 서버 종료 시 실행 =====
     logger.info("Lumi Agent 서버를 종료합니다...")
 
+    # 백그라운드 큐에 남은 팬레터 저장
+    try:
+        await tool_executor.fan_letter_repo.flush()
+    except Exception as e:
+        logger.warning(f"팬레터 저장 큐 정리 실패: {e}")
+
+
+async def _warmup_graph(graph) -> None:
+    """
+    그래프를 한 번 실행해서 LangChain/Pydantic 내부 초기화를 미리 끝냅니다.
+
+    warmup 전용 thread_id를 사용하고, 실행 후 체크포인트를 삭제합니다.
+    """
+    config = {"configurable": {"thread_id": "__warmup__"}}
+    try:
+        await graph.ainvoke(
+            create_initial_state(
+                session_id="__warmup__",
+                messages=[HumanMessage(content="ping")],
+            ),
+            config=config,
+        )
+        logger.info("LangGraph warmup 완료")
+    except Exception as e:
+        logger.warning(f"LangGraph warmup 실패: {e}")
+    finally:
+        if graph.checkpointer is not None:
+            graph.checkpointer.delete_thread("__warmup__")
+
 
 def _validate_settings():
     """
@@ -171,9 +217,14 @@ async def root() -> dict:
 if __name__ == "__main__":
     import uvicorn
 
+    # uvloop(libuv 기반 이벤트 루프) + httptools(C 기반 HTTP 파서)
+    # uvicorn[standard]에 포함되어 있음 (uvloop은 Windows 미지원)
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=1 if settings.debug else max(1, settings.workers),
         reload=settings.debug,
     )
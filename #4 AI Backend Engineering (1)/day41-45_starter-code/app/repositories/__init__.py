@@ -1,7 +1,12 @@
+import threading
+
 from loguru import logger
+from supabase import create_client
+
 from app.core.config import settings
 
 _supabase_client = None
+_supabase_lock = threading.Lock()
 
 def get_supabase_client():
     """
@@ -11,17 +16,25 @@ def get_supabase_client():
     """
     global _supabase_client
 
-    if _supabase_client is None and settings.supabase_url and settings.supabase_key:
-        try:
-            from supabase import create_client
-            _supabase_client = create_client(
-                settings.supabase_url,
-                settings.supabase_key
-            )
-            logger.info("Supabase 클라이언트 초기화 완료")
-        
-        except Exception as e:
-            logger.warning(f"Supabase 초기화 실패: {e}")
-            _supabase_client = None
-    
+    # 초기화 이후에는 lock 없이 바로 반환
+    if _supabase_client is not None:
+        return _supabase_client
+
+    if not (settings.supabase_url and settings.supabase_key):
+        return None
+
+    # Double-checked locking : 동시에 호출되어도 클라이언트는 하나만 생성
+    with _supabase_lock:
+        if _supabase_client is None:
+            try:
+                _supabase_client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_key
+                )
+                logger.info("Supabase 클라이언트 초기화 완료")
+
+            except Exception as e:
+                logger.warning(f"Supabase 초기화 실패: {e}")
+                _supabase_client = None
+
     return _supabase_client
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+쿼리 임베딩 디스크 캐시 (L2)
+
+메모리 LRU 캐시(L1)는 프로세스가 재시작되면 사라지므로
+SQLite 파일에 임베딩을 저장해서 재시작 후에도 재사용합니다.
+
+- 키 : blake2b(모델명 + 정규화된 쿼리) 16바이트 digest
+- 값 : int8로 양자화한 벡터 bytes + 벡터별 scale
+  (4096차원 기준 float32 16KB -> int8 4KB, 코사인 유사도 검색에는 충분한 정밀도)
+- 크기 제한 : max_entries개를 넘으면 오래 전에 저장된 항목부터 삭제
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+
+def quantize(embedding: list[float]) -> tuple[bytes, float]:
+    """
+    임베딩을 int8 bytes와 scale로 양자화
+
+    벡터의 최대 절댓값이 127이 되도록 scale을 정하고 반올림합니다.
+    """
+    arr = np.asarray(embedding, dtype=np.float32)
+    max_abs = float(np.max(np.abs(arr))) if arr.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    return np.round(arr / scale).astype(np.int8).tobytes(), scale
+
+
+def dequantize(data: bytes, scale: float) -> list[float]:
+    """int8 bytes와 scale로 임베딩을 복원"""
+    return (np.frombuffer(data, dtype=np.int8).astype(np.float32) * scale).tolist()
+
+
+class EmbeddingDiskCache:
+    """
+    SQLite 기반 임베딩 캐시
+
+    get/set은 디스크 I/O를 하는 동기 메서드이므로 async 코드에서는 asyncio.to_thread로 호출합니다.
+    (WAL 모드 + synchronous=NORMAL : 저장할 때마다 fsync하지 않음)
+
+    저장 prune_every번마다 항목 수를 확인해서 max_entries를 넘은 만큼
+    created_at이 오래된 항목부터 삭제합니다.
+
+    Attributes:
+        path: SQLite 파일 경로
+        max_entries: 보관할 최대 항목 수
+        prune_every: 몇 번 저장할 때마다 크기를 정리할지
+    """
+
+    def __init__(self, path: str, max_entries: int = 20000, prune_every: int = 100):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.prune_every = max(1, prune_every)
+        self._sets_since_prune = 0
+
+        # 여러 스레드(asyncio.to_thread 등)에서 접근할 수 있으므로 lock으로 보호
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_int8 "
+            "(key BLOB PRIMARY KEY, vec BLOB NOT NULL, scale REAL NOT NULL, "
+            "created_at REAL NOT NULL DEFAULT 0)"
+        )
+        # created_at 컬럼이 없던 기존 파일은 컬럼을 추가 (기존 항목은 0 -> 가장 먼저 정리됨)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings_int8)")}
+        if "created_at" not in columns:
+            self._conn.execute(
+                "ALTER TABLE embeddings_int8 ADD COLUMN created_at REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_int8_created_at ON embeddings_int8 (created_at)"
+        )
+        self._conn.commit()
+
+        with self._lock:
+            self._prune()
+
+        logger.info(f"임베딩 디스크 캐시 초기화 완료: {self.path}")
+
+    @staticmethod
+    def make_key(model: str, normalized_query: str) -> bytes:
+        """모델명과 정규화된 쿼리로 캐시 키 생성"""
+        return hashlib.blake2b(
+            f"{model}:{normalized_query}".encode(), digest_size=16
+        ).digest()
+
+    def get(self, key: bytes) -> list[float] | None:
+        """캐시된 임베딩을 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vec, scale FROM embeddings_int8 WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return dequantize(row[0], row[1])
+
+    def set(self, key: bytes, embedding: list[float]) -> None:
+        """임베딩을 int8로 양자화해서 저장"""
+        vec, scale = quantize(embedding)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings_int8 (key, vec, scale, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, vec, scale, time.time()),
+            )
+            self._conn.commit()
+
+            self._sets_since_prune += 1
+            if self._sets_since_prune >= self.prune_every:
+                self._prune()
+
+    def _prune(self) -> None:
+        """max_entries를 넘은 만큼 오래된 항목 삭제 (lock을 잡은 상태에서 호출)"""
+        self._sets_since_prune = 0
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings_int8").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings_int8 WHERE rowid IN "
+            "(SELECT rowid FROM embeddings_int8 ORDER BY created_at, rowid LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        logger.debug(f"임베딩 디스크 캐시 {excess}개 정리")
@@ -4,6 +4,7 @@
 Supabase에 팬들의 메세지를 저장합니다.
 """
 
+import asyncio
 from typing import Optional
 from loguru import logger
 
@@ -25,6 +26,10 @@ class FanLetterRepository:
             )
     """
 
+    # 백그라운드 저장 큐 크기 / 한 번에 insert할 최대 팬레터 수
+    QUEUE_MAX_SIZE = 1000
+    BATCH_SIZE = 100
+
     def __init__(self):
         """FanLetterRepository 초기화"""
         self.client = get_supabase_client()
@@ -32,6 +37,12 @@ class FanLetterRepository:
             logger.info("Supabase 연결됨")
         else:
             logger.warning("Supabase 미설정")
+
+        # 백그라운드 저장용 큐와 워커 (실행 중인 이벤트 루프에서 처음 사용할 때 생성)
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
     async def create(
         self,
         session_id: str,
@@ -52,7 +63,8 @@ class FanLetterRepository:
             str: 생성된 팬레터 ID
         """
         try:
-            response = (
+            # supabase-py는 동기 HTTP 호출이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+            response = await asyncio.to_thread(
                 self.client.table("fan_letters")
                 .insert({
                     "session_id": session_id,
@@ -60,7 +72,7 @@ class FanLetterRepository:
                     "category": category,
                     "message": message,
                 })
-                .execute()
+                .execute
             )
 
             letter_id = response.data[0]["id"]
@@ -70,4 +82,56 @@ class FanLetterRepository:
         
         except Exception as e:
             logger.info(f"Supabase 저장 오류: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+    async def create_background(
+        self,
+        session_id: str,
+        category: str,
+        message: str,
+        user_id: Optional[str] = None,
+    ) -> None:
+        """
+        팬레터 저장을 백그라운드 큐에 넣고 바로 반환합니다.
+
+        팬레터 ID가 필요 없는 경우 사용하며, 사용자는 DB 저장을 기다리지 않습니다.
+        한꺼번에 몰린 팬레터는 워커가 모아서 한 번에 insert합니다.
+        큐가 가득 차면 빈 자리가 생길 때까지 기다립니다. (backpressure)
+        """
+        self._ensure_worker()
+        await self._queue.put({
+            "session_id": session_id,
+            "user_id": user_id,
+            "category": category,
+            "message": message,
+        })
+
+    async def flush(self) -> None:
+        """큐에 남은 팬레터가 모두 저장될 때까지 기다립니다. (서버 종료 시)"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.QUEUE_MAX_SIZE)
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            rows = [await self._queue.get()]
+            # 이미 쌓여 있는 팬레터를 모아서 배치로 저장
+            while len(rows) < self.BATCH_SIZE and not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+
+            try:
+                await asyncio.to_thread(
+                    self.client.table("fan_letters").insert(rows).execute
+                )
+                logger.info(f"Supabase 팬레터 백그라운드 저장: {len(rows)}건")
+            except Exception as e:
+                logger.error(f"Supabase 백그라운드 저장 오류 ({len(rows)}건): {e}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
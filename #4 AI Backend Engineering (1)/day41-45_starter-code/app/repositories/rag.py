@@ -1,9 +1,83 @@
+import asyncio
+import re
+import threading
+import unicodedata
+from functools import lru_cache
 from typing import Literal
+import httpx
+from cachetools import LRUCache
 from loguru import logger
 from langchain_upstage import UpstageEmbeddings
 from supabase import create_client, Client
 
 from app.core.config import settings
+from app.repositories.embedding_cache import EmbeddingDiskCache
+
+# 쿼리 임베딩 캐시(L1) : (모델명, 정규화된 쿼리) -> 임베딩 벡터
+# 같은 질문이 반복되면 Upstage 임베딩 API 호출 없이 바로 검색
+# 프로세스가 재시작되면 비워지므로 디스크 캐시(L2, get_embedding_disk_cache)가 뒤를 받침
+_EMBEDDING_CACHE: LRUCache[tuple[str, str], list[float]] = LRUCache(maxsize=1024)
+
+# 임베딩 HTTP 커넥션 풀 설정 : 동시에 들어온 aembed_query 호출이 keep-alive 연결을 공유
+_EMBEDDING_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    임베딩 캐시 키용 쿼리 정규화
+
+    "마늘 좋아해?", "마늘 좋아해", "마늘  좋아해?"처럼
+    문장부호/공백/대소문자만 다른 질문을 같은 키로 취급합니다.
+    (NFKC 유니코드 정규화 -> 소문자 -> 문장부호 제거 -> 공백 정리)
+    """
+    query = unicodedata.normalize("NFKC", query).lower()
+    query = _PUNCT_RE.sub("", query)
+    return _SPACE_RE.sub(" ", query).strip()
+
+def _summarize_docs(docs: list[dict]) -> str:
+    """검색 결과를 한 줄로 요약 (디버그 로그용)"""
+    return ", ".join(
+        f"v{doc.get('metadata', {}).get('version', '?')}"
+        f"({doc.get('metadata', {}).get('status', '?')}): {doc.get('similarity', 0):.3f}"
+        for doc in docs
+    )
+
+@lru_cache
+def get_embeddings() -> UpstageEmbeddings:
+    """
+    Upstage 임베딩 클라이언트를 반환 (싱글톤 패턴)
+
+    임베딩 클라이언트를 새로 만들면 내부 HTTP 커넥션 풀(TCP/TLS 연결)도 새로 만들어지므로
+    lru_cache로 한 번만 생성하고 모든 Repository와 요청에서 재사용합니다.
+    """
+    return UpstageEmbeddings(
+        api_key=settings.upstage_api_key,
+        model="solar-embedding-1-large-passage",
+        http_client=httpx.Client(limits=_EMBEDDING_HTTP_LIMITS),
+        http_async_client=httpx.AsyncClient(limits=_EMBEDDING_HTTP_LIMITS),
+    )
+
+@lru_cache
+def get_embedding_disk_cache() -> EmbeddingDiskCache | None:
+    """
+    임베딩 디스크 캐시(L2)를 반환 (싱글톤 패턴)
+
+    embedding_cache_path가 비어 있거나 파일을 열 수 없으면 None (메모리 캐시만 사용)
+    """
+    if not settings.embedding_cache_path:
+        return None
+
+    try:
+        return EmbeddingDiskCache(
+            settings.embedding_cache_path,
+            max_entries=settings.embedding_cache_max_entries,
+        )
+    except Exception as e:
+        logger.warning(f"임베딩 디스크 캐시 초기화 실패: {e}")
+        return None
 
 class RAGRepository:
     """
@@ -25,10 +99,7 @@ class RAGRepository:
         """
         RAGRepository 초기화
         """
-        self.embeddings = UpstageEmbeddings(
-            api_key = settings.upstag_api_key,
-            model="solar-embedding-1-large-passage"
-        )
+        self.embeddings = get_embeddings()
 
         self.supabase : Client = create_client(
             settings.supabase_url,
@@ -42,6 +113,7 @@ class RAGRepository:
         query: str,
         k: int = 3,
         filter_status: Literal["active", "deprecated", "all"] = "active",
+        ef_search: int | None = None,
     ) -> list[dict]:
         """
         쿼리와 유사한 문서를 검색합니다.
@@ -54,6 +126,8 @@ class RAGRepository:
             query: 검색 쿼리
             k: 반환할 문서 수 (기본값: 3)
             filter_status: 필터링 조건 (기본값: "active")
+            ef_search: HNSW 검색 후보 수 (None이면 DB 기본값 40)
+                - 작게: 빠른 응답 / 크게: 높은 recall
 
         Returns:
             list[dict]: 검색된 문서 목록
@@ -81,8 +155,8 @@ class RAGRepository:
             # 2. DB에서 코사인 유사도가 높은 문서 k개를 검색
             # 3. 메타데이터 필터로 원하는 문서만 반환
 
-            # Step 1: 쿼리 임베딩
-            query_embedding = await self.embeddings.aembed_query(query)
+            # Step 1: 쿼리 임베딩 (캐시에 있으면 API 호출 생략)
+            query_embedding = await self._embed_query(query)
 
             # [지식] Supabase RPC
             # PostgreSQL의 저장 함수(Stored Function)를 호출하는 방식입니다.
@@ -90,24 +164,25 @@ class RAGRepository:
             # RPC를 사용하면 복잡한 쿼리를 서버에서 효율적으로 처리할 수 있습니다.
             # Step 2: Supabase RPC로 유사 문서 검색
             # filter_status 파라미터 추가
-            result = self.supabase.rpc(
-                "match_documents",
-                {
-                    "query_embedding": query_embedding,
-                    "match_count": k,
-                    "filter_status": filter_status #필터링?
-                }
-            ).execute()
+            params = {
+                "query_embedding": query_embedding,
+                "match_count": k,
+                "filter_status": filter_status #필터링?
+            }
+            if ef_search is not None:
+                params["ef_search"] = ef_search
+
+            # supabase-py는 동기 HTTP 호출이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+            result = await asyncio.to_thread(
+                self.supabase.rpc("match_documents", params).execute
+            )
 
             docs = result.data or []
 
             # 결과 로깅 (디버깅용)
-            for doc in docs:
-                version = doc.get("metadata", {}).get("version", "?")
-                status = doc.get("metadata", {}).get("status", "?")
-                similarity = doc.get("similarity", 0)
-                logger.debug(f" -v{version} ({status}): {similarity:.3f}")
-            
+            # lazy=True : DEBUG 레벨이 꺼져 있으면 요약 문자열을 아예 만들지 않음
+            logger.opt(lazy=True).debug("RAG 검색 문서: {}", lambda: _summarize_docs(docs))
+
             logger.info(f"RAG 검색 결과: {len(docs)}개 문서")
 
             return docs
@@ -116,6 +191,106 @@ class RAGRepository:
             logger.error(f"RAG 검색 실패: {e}")
             return []
         
+    async def search_similar_batch(
+        self,
+        queries: list[str],
+        k: int = 3,
+        filter_status: Literal["active", "deprecated", "all"] = "active",
+        ef_search: int | None = None,
+    ) -> list[list[dict]]:
+        """
+        여러 쿼리를 한 번의 RPC 호출로 검색합니다.
+
+        질문을 여러 개의 하위 질문으로 나눠 검색할 때
+        search_similar를 N번 호출하면 DB 왕복도 N번이므로,
+        임베딩은 동시에 계산하고 match_documents_batch로 한 번에 검색합니다.
+
+        Args:
+            queries: 검색 쿼리 목록
+            k: 쿼리별 반환할 문서 수 (기본값: 3)
+            filter_status: 필터링 조건 (기본값: "active")
+            ef_search: HNSW 검색 후보 수 (None이면 DB 기본값 40)
+
+        Returns:
+            list[list[dict]]: queries와 같은 순서의 쿼리별 검색 결과
+                (각 문서 형식은 search_similar와 동일)
+        """
+        if not queries:
+            return []
+
+        logger.info(f"RAG 배치 검색: {len(queries)}개 쿼리 (k={k}, filter={filter_status})")
+
+        try:
+            query_embeddings = await asyncio.gather(
+                *(self._embed_query(query) for query in queries)
+            )
+
+            params = {
+                "query_embeddings": query_embeddings,
+                "match_count": k,
+                "filter_status": filter_status,
+            }
+            if ef_search is not None:
+                params["ef_search"] = ef_search
+
+            result = await asyncio.to_thread(
+                self.supabase.rpc("match_documents_batch", params).execute
+            )
+
+            # query_idx 기준으로 결과를 쿼리별로 나눔
+            grouped: list[list[dict]] = [[] for _ in queries]
+            for doc in result.data or []:
+                grouped[doc.pop("query_idx")].append(doc)
+
+            logger.info(f"RAG 배치 검색 결과: {[len(docs) for docs in grouped]}")
+
+            return grouped
+
+        except Exception as e:
+            logger.error(f"RAG 배치 검색 실패: {e}")
+            return [[] for _ in queries]
+
+    async def _embed_query(self, query: str) -> list[float]:
+        """
+        쿼리를 임베딩합니다. (메모리 LRU 캐시 -> 디스크 캐시 -> 임베딩 API 순서)
+
+        캐시 키에 모델명을 포함해서 모델이 바뀌면 자동으로 다시 임베딩합니다.
+        캐시 키는 정규화된 쿼리, 임베딩은 사용자가 입력한 원본 쿼리로 계산합니다.
+        """
+        key = (self.embeddings.model, normalize_query(query))
+
+        cached = _EMBEDDING_CACHE.get(key)
+        if cached is not None:
+            logger.debug("쿼리 임베딩 캐시 hit")
+            return cached
+
+        disk_cache = get_embedding_disk_cache()
+        disk_key = EmbeddingDiskCache.make_key(*key) if disk_cache else None
+
+        # 디스크 캐시 오류는 검색 실패로 이어지지 않도록 API 호출로 대체
+        # SQLite 조회/저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+        if disk_cache:
+            try:
+                cached = await asyncio.to_thread(disk_cache.get, disk_key)
+            except Exception as e:
+                logger.warning(f"임베딩 디스크 캐시 조회 실패: {e}")
+
+            if cached is not None:
+                logger.debug("쿼리 임베딩 디스크 캐시 hit")
+                _EMBEDDING_CACHE[key] = cached
+                return cached
+
+        embedding = await self.embeddings.aembed_query(query)
+        _EMBEDDING_CACHE[key] = embedding
+
+        if disk_cache:
+            try:
+                await asyncio.to_thread(disk_cache.set, disk_key, embedding)
+            except Exception as e:
+                logger.warning(f"임베딩 디스크 캐시 저장 실패: {e}")
+
+        return embedding
+
     async def search_without_filter(self, query: str, k: int=3) -> list[dict]:
         """
         필터링 없이 검색 (시연용)
@@ -135,6 +310,7 @@ class RAGRepository:
     
 # 싱글톤 인스턴스
 _rag_repository: RAGRepository | None = None
+_rag_repository_lock = threading.Lock()
 
 def get_rag_repository() -> RAGRepository:
     """
@@ -145,7 +321,13 @@ def get_rag_repository() -> RAGRepository:
     """
     global _rag_repository
 
-    if _rag_repository is None:
-        _rag_repository = RAGRepository()
+    # 초기화 이후에는 lock 없이 바로 반환
+    if _rag_repository is not None:
+        return _rag_repository
+
+    # Double-checked locking : 동시에 호출되어도 인스턴스는 하나만 생성
+    with _rag_repository_lock:
+        if _rag_repository is None:
+            _rag_repository = RAGRepository()
 
     return _rag_repository 
\ No newline at end of file
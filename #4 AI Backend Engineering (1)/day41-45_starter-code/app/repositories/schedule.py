@@ -4,6 +4,7 @@
 Supabase에서 루미의 스케줄 데이터를 조회합니다.
 """
 
+import asyncio
 from typing import Optional
 from loguru import logger
 
@@ -67,7 +68,8 @@ class ScheduleRepository:
             if event_type:
                 query = query.eq("event_type", event_type)
 
-            response = query.order("start_time").execute()
+            # supabase-py는 동기 HTTP 호출이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+            response = await asyncio.to_thread(query.order("start_time").execute)
 
             logger.info(f"Supabase 결과: {len(response.data)}건")
             return response.data
@@ -4,6 +4,7 @@
 이 모듈에서 채팅 관련 API의 데이터 모델을 정의합니다.
 2강에서 실제 채팅 API 구현 시 사용됩니다.
 """
+import orjson
 from pydantic import BaseModel, Field
 from typing import Any, Optional, Literal
 from datetime import datetime, timezone
@@ -152,24 +153,34 @@ class StreamEvent(BaseModel):
         description="에러 메시지",
     )
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """
-        SSE 형식 문자열로 변환
+        SSE 형식 bytes로 변환
+
+        StreamingResponse는 bytes를 그대로 전송하므로
+        문자열로 decode했다가 다시 encode하는 과정을 생략합니다.
         """
         # 파이썬 표준 json 라이브러리(json) 보다 더 속도가 빠른 라이브러리(orjson)
-        
-        import orjson       
-        # data = {}
-        # for k, v in self.model_dump().items():
-        #    # SSE 형태로 데이터를 변환, 값이 None인 것은 제외, None이 아닌 것만 데이터를 추가
-        #    if v is not None:
-        #        data[k] = v
-        # 위 형태를 for문이 아니라 dict comprehension으로
-        data = {k: v for k, v in self.model_dump().items() if v is not None}
-        json_str = orjson.dumps(data).decode("utf-8")
-        # dumps가 bytes를 반환해서 decode를 사용해서 반환(문자열) -> SSE로 보내려면 문자열이 필요하기 때문
-        
-        return f'data: {json_str}\n\n'
+        # exclude_none=True : 값이 None인 필드는 제외 (dict comprehension으로 거를 필요 없음)
+        data = self.model_dump(exclude_none=True, mode="json")
+        return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+# token 이벤트는 항상 {"type":"token","content":...} 형태이므로 앞뒤를 bytes로 고정
+_TOKEN_SSE_PREFIX = b'data: {"type":"token","content":'
+_TOKEN_SSE_SUFFIX = b'}\n\n'
+
+
+def format_token_sse(content: str) -> bytes:
+    """
+    token 이벤트를 SSE bytes로 변환 (Pydantic 모델 생성 없이)
+
+    토큰 이벤트는 응답 하나에 수백 번 발생하므로
+    StreamEvent도 dict도 만들지 않고 content 문자열만 직렬화합니다.
+    StreamEvent는 thinking, tool, response, error 같은 드문 이벤트에만 사용합니다.
+    """
+    return _TOKEN_SSE_PREFIX + orjson.dumps(content) + _TOKEN_SSE_SUFFIX
+
 
 # event = StreamEvent(type="thinking", node="router")
 # print("model_dump", event.model_dump())
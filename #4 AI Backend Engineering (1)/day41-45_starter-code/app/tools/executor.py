@@ -10,6 +10,8 @@ recommend_song : Mock
 get_weather : Mock
 """
 
+import asyncio
+import itertools
 import random
 from typing import Any, Optional
 from loguru import logger
@@ -34,6 +36,40 @@ MOCK_WEATHER = {
     "wind_speed": 3.2
 }
 
+# Mock Tool 응답은 매번 같은 구조이므로 모듈 로드 시 미리 만들어 둠
+# 호출자가 응답을 수정해도 원본이 바뀌지 않도록 반환할 때는 _copy_response로 복사
+_WEATHER_RESPONSE = {
+    "success": True,
+    "data": MOCK_WEATHER,
+    "mock": True,
+}
+
+# mood -> 곡별 완성된 응답 목록
+_SONG_RESPONSES = {
+    mood: [
+        {
+            "success": True,
+            "data": {"song": song, "mood": mood},
+            "mock": True, # Mock 데이터임을 표시
+        }
+        for song in songs
+    ]
+    for mood, songs in LUMI_SONGS.items()
+}
+
+# mood -> 미리 섞어 둔 응답 목록을 순환하는 iterator
+# 호출마다 random.choice로 전역 RNG 상태를 바꾸지 않고 next()만 하면 됨
+_SONG_RESPONSE_CYCLES = {
+    mood: itertools.cycle(random.sample(responses, len(responses)))
+    for mood, responses in _SONG_RESPONSES.items()
+}
+
+
+def _copy_response(response: dict) -> dict:
+    """미리 만들어 둔 응답을 data까지 복사해서 반환 (얕은 구조라 2단계 복사로 충분)"""
+    return {**response, "data": dict(response["data"])}
+
+
 class ToolExecutor:
     """
     Tool 실행기
@@ -85,6 +121,34 @@ class ToolExecutor:
                 "error": str(e)
             }
     
+    async def execute_many(
+        self,
+        calls: list[dict],
+        session_id: str,
+        user_id: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        """
+        여러 Tool을 동시에 실행합니다
+
+        calls : [{"name": "get_schedule", "args": {...}}, ...]
+        각 Tool의 I/O(Supabase 등)가 겹쳐서 실행되므로
+        전체 시간이 합이 아니라 가장 느린 Tool 시간에 가까워짐
+        결과는 calls와 같은 순서로 반환
+        """
+        results = await asyncio.gather(
+            *(
+                self.execute(call["name"], call.get("args") or {}, session_id, user_id)
+                for call in calls
+            ),
+            return_exceptions=True,
+        )
+
+        return [
+            {"success": False, "error": str(result)}
+            if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
     async def _get_schedule(self, args:dict) -> dict:
         """
         Supabase에서 스케줄 데이터 조회
@@ -118,7 +182,7 @@ class ToolExecutor:
             }
         }
     
-    async def send_fan_letter(
+    async def _send_fan_letter(
         self,
         args: dict,
         session_id: str,
@@ -132,7 +196,8 @@ class ToolExecutor:
 
         logger.info(f"팬레터 저장: category={category}, message={message[:50]}...")
 
-        letter_id = await self.fan_letter_repo.create(
+        # 응답에 팬레터 ID가 필요 없으므로 DB 저장을 기다리지 않고 백그라운드로 저장
+        await self.fan_letter_repo.create_background(
             session_id=session_id,
             user_id=user_id,
             category=category,
@@ -142,7 +207,8 @@ class ToolExecutor:
         return {
             "success": True,
             "data": {
-                "letter_id": letter_id,
+                "letter_id": None,
+                "queued": True,
                 "message": "팬레터가 잘 전달됐어요",
             }
         }
@@ -153,26 +219,20 @@ class ToolExecutor:
         """
         mood = args.get("mood", "happy")
         logger.info(f"노래추천: mood={mood}")
-        songs = LUMI_SONGS.get(mood, LUMI_SONGS["happy"])
-        selected = random.choice(songs)
 
-        return {
-            "success": True,
-            "data": {
-                "song": selected,
-                "mood": mood,
-            },
-            "mock": True, # Mock 데이터임을 표시
-        }
+        responses = _SONG_RESPONSE_CYCLES.get(mood)
+        if responses is not None:
+            return _copy_response(next(responses))
+
+        # 목록에 없는 mood는 happy 곡 중에서 추천 (요청한 mood는 그대로 표시)
+        response = _copy_response(next(_SONG_RESPONSE_CYCLES["happy"]))
+        response["data"]["mood"] = mood
+        return response
     
     async def _get_weather(self, args: dict) -> dict:
         """
         """
 
         logger.info("날씨 조회(Mock)")
-        
-        return {
-            "success": True,
-            "data": MOCK_WEATHER,
-            "mock": True,
-        }
\ No newline at end of file
+
+        return _copy_response(_WEATHER_RESPONSE)
\ No newline at end of file
@@ -105,10 +105,13 @@ async def insert_sample_schedules(client) -> int:
             return 0
 
         # 데이터 삽입
-        result = client.table("schedules").insert(SAMPLE_SCHEDULES).execute()
+        # returning="minimal" : 삽입된 행을 응답으로 돌려받지 않음 (Prefer: return=minimal)
+        # 응답에 행이 없으므로 삽입 건수는 보낸 데이터 수로 계산
+        client.table("schedules").insert(SAMPLE_SCHEDULES, returning="minimal").execute()
+        inserted_count = len(SAMPLE_SCHEDULES)
 
-        logger.info(f"{len(result.data)}개의 스케줄 데이터가 삽입되었습니다.")
-        return len(result.data)
+        logger.info(f"{inserted_count}개의 스케줄 데이터가 삽입되었습니다.")
+        return inserted_count
 
     except Exception as e:
         logger.error(f"스케줄 데이터 삽입 실패: {e}")
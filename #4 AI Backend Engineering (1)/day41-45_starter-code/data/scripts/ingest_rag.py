@@ -2,8 +2,8 @@
 루미 세계관 문서를 벡터 DB에 적재하는 스크립트 (멱등성 보장)
 
 이 스크립트는 다음 작업을 수행합니다:
-1. 기존 documents 테이블 비우기 (truncate) → 멱등성 보장
-2. Markdown 문서 로드 및 메타데이터 추출
+1. 이미 적재된 문서 확인 (--full이면 documents 테이블 비우기)
+2. Markdown 문서 로드 및 메타데이터 추출 (내용이 바뀌지 않은 문서는 건너뜀)
 3. 문서 청킹 (RecursiveCharacterTextSplitter)
 4. Upstage Embedding으로 벡터화
 5. Supabase pgvector에 저장
@@ -15,9 +15,15 @@
     # v2.5 (active)만 적재 (Distractor 제외)
     uv run python scripts/ingest_rag.py --active-only
 
+    # 기존 데이터를 모두 삭제하고 처음부터 다시 적재
+    uv run python scripts/ingest_rag.py --full
+
 멱등성:
     이 스크립트는 몇 번을 실행해도 동일한 결과를 보장합니다.
-    실행 시 기존 데이터를 모두 삭제하고 새로 적재합니다.
+    각 청크 메타데이터에 원본 파일명과 내용 해시(sha256)를 저장해 두고,
+    해시가 같은 문서는 임베딩 없이 건너뜁니다.
+    내용이 바뀐 문서는 기존 청크를 지우고 다시 적재하며,
+    이번 적재 대상이 아닌 문서의 청크는 삭제합니다.
 
 Distractor란?
     RAG 시스템의 메타데이터 필터링을 테스트하기 위한 "방해 문서"입니다.
@@ -36,15 +42,151 @@ Distractor란?
 
 import argparse
 import asyncio
-import json
+import hashlib
+import os
 import re
 import sys
+import time
+from collections import Counter
 from pathlib import Path
 
+import anyio
+import httpx
+import orjson
+
 # 프로젝트 루트를 PYTHONPATH에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from loguru import logger
+from supabase import Client, create_client
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from app.core.config import settings
+from app.core.batching import BatchingClient
+from app.repositories.rag import get_embeddings
+
+# 임베딩 API 한 번에 보낼 청크 수 / 동시 요청 수
+# 배치가 가득 차지 않아도 EMBED_BATCH_WAIT_MS가 지나면 전송
+EMBED_BATCH_SIZE = 96
+EMBED_BATCH_WAIT_MS = 50
+EMBED_CONCURRENCY = 4
+
+# 임베딩 API 초당 최대 요청 수 (환경변수 EMBED_RATE_LIMIT로 조정)
+# Semaphore는 동시 요청 수만 제한하므로 응답이 빠르면 순간적으로 한도를 넘을 수 있음
+EMBED_RATE_LIMIT = float(os.getenv("EMBED_RATE_LIMIT", "10"))
+
+# 동시에 임베딩할 문서 파일 수 = embed_worker 수 (환경변수 INGEST_CONCURRENCY로 조정)
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "8"))
+
+# 파이프라인 단계(로드 -> 임베딩 -> 저장) 사이 큐의 최대 크기
+PIPELINE_QUEUE_SIZE = 4
+
+# 일시적인 API 오류(rate limit, 서버 오류) 재시도 설정
+INGEST_MAX_ATTEMPTS = 3
+_TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_TRANSIENT_MESSAGES = ("rate limit", "quota", "too many requests")
+
+# Supabase에 한 번에 insert할 행 수 (4096차원 벡터라 요청 크기를 고려해 100행)
+SAVE_BATCH_SIZE = 100
+
+# 로그 구분선
+SEP_EQ = "=" * 60
+SEP_DASH = "-" * 40
+HEADER = "\n" + SEP_EQ
+
+# 적재 결과 로그에 표시할 문서 status별 이모지 (목록에 없는 status는 ❓)
+STATUS_EMOJI: dict[str, str] = {
+    "active": "✅",
+    "archived": "📦",
+    "deprecated": "📦",
+}
+
+# 문서 상단의 RAG_METADATA 블록 (<!-- RAG_METADATA: {...} -->)
+_METADATA_RE = re.compile(r"RAG_METADATA:\s*(\{.*?\})\s*-->", re.DOTALL)
+
+
+class AsyncRateLimiter:
+    """
+    토큰 버킷 방식의 비동기 rate limiter
+
+    time_period 동안 최대 max_rate번 진입을 허용합니다.
+    토큰은 시간에 비례해서 채워지므로 요청이 한순간에 몰리지 않고 고르게 나갑니다.
+
+    사용법:
+        limiter = AsyncRateLimiter(10, 1)  # 초당 10회
+        async with limiter:
+            await call_api()
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError(f"max_rate/time_period는 0보다 커야 합니다: {max_rate}/{time_period}")
+        self.max_rate = max_rate
+        self.time_period = time_period
+        # 버킷 용량은 최소 1 (max_rate가 1 미만이면 토큰이 1개까지 차지 않아 영원히 대기함)
+        self._capacity = max(1.0, max_rate)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        # 대기 중인 호출이 도착한 순서대로 토큰을 받도록 lock으로 직렬화
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refill = (now - self._updated_at) * self.max_rate / self.time_period
+                self._tokens = min(self._capacity, self._tokens + refill)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                # 토큰 하나가 채워질 때까지 대기
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+# 모든 파일의 임베딩 요청이 공유하는 limiter
+EMBED_LIMITER = AsyncRateLimiter(EMBED_RATE_LIMIT, 1)
+
+
+class _EmbedDocuments:
+    """
+    BatchingClient가 모은 청크들을 aembed_documents 한 번으로 임베딩하는 어댑터
+
+    초당 요청 수는 EMBED_LIMITER로 제한합니다.
+    """
+
+    async def abatch(self, texts: list[str], config=None, *, return_exceptions: bool = False) -> list:
+        try:
+            async with EMBED_LIMITER:
+                return await get_embeddings().aembed_documents(texts)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            # 배치가 실패하면 그 배치에 청크가 있는 문서들이 각자 재시도(embed_document)
+            return [e] * len(texts)
+
+
+# 모든 파일의 청크 임베딩 요청이 공유하는 배처
+# 동시에 임베딩 중인 모든 파일의 청크를 모아 한 요청(최대 EMBED_BATCH_SIZE개)으로 전송하고,
+# 전송 중인 배치는 최대 EMBED_CONCURRENCY개 (app/core/batching.py의 BatchingClient 재사용)
+EMBED_BATCHER = BatchingClient(
+    _EmbedDocuments(),
+    max_batch_size=EMBED_BATCH_SIZE,
+    max_wait_ms=EMBED_BATCH_WAIT_MS,
+    max_concurrency=EMBED_CONCURRENCY,
+)
 
 
 def extract_metadata(content: str) -> dict:
@@ -66,15 +208,14 @@ def extract_metadata(content: str) -> dict:
     Returns:
         dict: 추출된 메타데이터 (없으면 기본값)
     """
-    pattern = r'RAG_METADATA:\s*(\{[\s\S]*?\})\s*-->'
-    match = re.search(pattern, content)
+    match = _METADATA_RE.search(content)
 
     if match:
         try:
-            metadata = json.loads(match.group(1))
+            metadata = orjson.loads(match.group(1))
             logger.info(f"메타데이터 추출 성공: {metadata.get('version', 'unknown')}")
             return metadata
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning(f"메타데이터 JSON 파싱 실패: {e}")
 
     # 기본 메타데이터
@@ -99,8 +240,6 @@ def chunk_document(content: str, chunk_size: int = 500, chunk_overlap: int = 50)
     Returns:
         list[str]: 청크 목록
     """
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
-
     # 마크다운 섹션 구분자 기준으로 분할
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
@@ -132,42 +271,54 @@ async def embed_chunks(chunks: list[str]) -> list[list[float]]:
     Returns:
         list[list[float]]: 임베딩 벡터 목록
     """
-    from langchain_upstage import UpstageEmbeddings
-    from app.core.config import settings
-
     if not settings.upstage_api_key:
         raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다.")
 
-    embeddings = UpstageEmbeddings(
-        api_key=settings.upstage_api_key,
-        model="solar-embedding-1-large-passage"  # 4096차원
-    )
-
     logger.info(f"{len(chunks)}개 청크 임베딩 시작...")
 
     # 배치로 임베딩 (API 호출 최소화)
-    vectors = await embeddings.aembed_documents(chunks)
+    # 청크를 EMBED_BATCHER에 넣으면 동시에 임베딩 중인 다른 파일의 청크와 함께
+    # 한 요청(최대 EMBED_BATCH_SIZE개)으로 묶여서 전송됨 (solar-embedding-1-large-passage, 4096차원)
+    # return_exceptions=True : 한 청크가 실패해도 나머지 청크가 모두 끝날 때까지 기다린 뒤 실패 처리
+    # (먼저 실패를 올리면 나머지 Future의 예외가 회수되지 않고,
+    #  embed_document 재시도 때 아직 전송 중인 청크를 한 번 더 보내게 됨)
+    results = await asyncio.gather(
+        *(EMBED_BATCHER.ainvoke(chunk) for chunk in chunks),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    vectors = list(results)
 
     logger.info(f"임베딩 완료: {len(vectors)}개 벡터 (차원: {len(vectors[0])})")
 
     return vectors
 
 
-async def truncate_documents() -> int:
+def create_supabase_client() -> Client:
     """
-    documents 테이블의 모든 데이터를 삭제합니다. (멱등성 보장)
+    Supabase 클라이언트를 생성합니다. (실행 동안 하나를 재사용)
 
     Returns:
-        int: 삭제된 레코드 수
+        Client: Supabase 클라이언트
     """
-    from supabase import create_client
-    from app.core.config import settings
-
     if not settings.supabase_url or not settings.supabase_key:
         raise ValueError("Supabase 설정이 완료되지 않았습니다.")
 
-    client = create_client(settings.supabase_url, settings.supabase_key)
+    return create_client(settings.supabase_url, settings.supabase_key)
+
+
+async def truncate_documents(client: Client) -> int:
+    """
+    documents 테이블의 모든 데이터를 삭제합니다. (멱등성 보장)
+
+    Args:
+        client: Supabase 클라이언트
 
+    Returns:
+        int: 삭제된 레코드 수
+    """
     # 기존 데이터 수 확인
     existing = client.table("documents").select("id", count="exact").execute()
     existing_count = existing.count or 0
@@ -182,13 +333,101 @@ async def truncate_documents() -> int:
     return existing_count
 
 
-async def save_to_supabase(
+async def fetch_indexed_files(client: Client) -> dict[str, str | None]:
+    """
+    이미 적재된 문서의 파일명별 내용 해시를 조회합니다.
+
+    파일마다 청크 0번 행에서 해시와 chunk_total을 읽고, 실제 저장된 행 수와
+    비교합니다. 중간에 실패해 일부 청크만 남은 파일은 해시를 None으로 돌려
+    건너뛰지 않고 다시 적재되게 합니다.
+
+    Args:
+        client: Supabase 클라이언트
+
+    Returns:
+        dict[str, str | None]: 파일명 -> 내용 sha256 (청크 수가 맞지 않으면 None)
+    """
+    result = await asyncio.to_thread(
+        client.table("documents")
+        .select(
+            "source_file:metadata->>source_file,"
+            "source_sha256:metadata->>source_sha256,"
+            "chunk_total:metadata->>chunk_total"
+        )
+        .eq("metadata->>chunk_index", "0")
+        .execute
+    )
+    heads = [row for row in result.data or [] if row["source_file"]]
+
+    async def count_rows(filename: str) -> int:
+        counted = await asyncio.to_thread(
+            client.table("documents")
+            .select("id", count="exact", head=True)
+            .eq("metadata->>source_file", filename)
+            .execute
+        )
+        return counted.count or 0
+
+    counts = await asyncio.gather(*(count_rows(row["source_file"]) for row in heads))
+
+    indexed: dict[str, str | None] = {}
+    for row, count in zip(heads, counts):
+        if str(count) != row["chunk_total"]:
+            logger.warning(
+                "⚠️ {}: 청크 {}/{}개만 저장되어 있어 다시 적재합니다",
+                row["source_file"],
+                count,
+                row["chunk_total"],
+            )
+            indexed[row["source_file"]] = None
+            continue
+        indexed[row["source_file"]] = row["source_sha256"]
+
+    return indexed
+
+
+async def delete_file_documents(client: Client, filenames: list[str]) -> None:
+    """
+    지정한 파일들의 청크를 삭제합니다.
+
+    Args:
+        client: Supabase 클라이언트
+        filenames: 삭제할 파일명 목록
+    """
+    await asyncio.to_thread(
+        client.table("documents").delete().in_("metadata->>source_file", filenames).execute
+    )
+
+
+async def prune_documents(client: Client, keep: set[str], indexed: dict[str, str | None]) -> None:
+    """
+    이번 적재 대상이 아닌 문서의 청크를 삭제합니다.
+
+    - 적재 대상에서 빠진 파일 (예: --active-only로 실행하면 v1.0)
+    - 파일명/해시 메타데이터가 없는 예전 방식으로 적재된 청크 (다시 적재됨)
+
+    Args:
+        client: Supabase 클라이언트
+        keep: 이번에 적재할 파일명 집합
+        indexed: fetch_indexed_files 결과
+    """
+    stale = sorted(indexed.keys() - keep)
+    if stale:
+        await delete_file_documents(client, stale)
+        logger.info("🗑️ 적재 대상이 아닌 문서 삭제: {}", ", ".join(stale))
+
+    await asyncio.to_thread(
+        client.table("documents").delete().is_("metadata->>source_file", "null").execute
+    )
+
+
+def build_rows(
     chunks: list[str],
     vectors: list[list[float]],
     metadata: dict
-) -> int:
+) -> list[dict]:
     """
-    청크와 벡터를 Supabase에 저장합니다.
+    청크와 벡터를 documents 테이블 행으로 변환합니다.
 
     Args:
         chunks: 청크 목록
@@ -196,66 +435,157 @@ async def save_to_supabase(
         metadata: 문서 메타데이터
 
     Returns:
-        int: 저장된 레코드 수
+        list[dict]: 저장할 행 목록 (각 청크별 메타데이터 = 원본 + 청크 인덱스)
     """
-    from supabase import create_client
-    from app.core.config import settings
+    return [
+        {
+            "content": chunk,
+            "embedding": vector,
+            "metadata": {**metadata, "chunk_index": i, "chunk_total": len(chunks)},
+        }
+        for i, (chunk, vector) in enumerate(zip(chunks, vectors))
+    ]
 
-    if not settings.supabase_url or not settings.supabase_key:
-        raise ValueError("Supabase 설정이 완료되지 않았습니다.")
 
-    client = create_client(settings.supabase_url, settings.supabase_key)
+async def save_to_supabase(
+    client: Client,
+    batch: list[tuple[str, dict]]
+) -> Counter[str]:
+    """
+    여러 파일의 행을 한 번의 insert로 Supabase에 저장합니다.
+
+    배치 insert가 실패하면 한 행씩 다시 시도해서 문제 있는 청크만 건너뜁니다.
 
-    logger.info("Supabase에 저장 시작...")
+    Args:
+        client: Supabase 클라이언트
+        batch: (파일명, 행) 목록
 
-    saved_count = 0
-    for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
-        try:
-            # 각 청크별 메타데이터 (원본 + 청크 인덱스)
-            chunk_metadata = {
-                **metadata,
-                "chunk_index": i,
-                "chunk_total": len(chunks)
-            }
+    Returns:
+        Counter[str]: 파일별 저장된 레코드 수
+    """
+    saved: Counter[str] = Counter()
 
-            result = client.table("documents").insert({
-                "content": chunk,
-                "embedding": vector,
-                "metadata": chunk_metadata
-            }).execute()
+    # returning="minimal" : 저장한 행(4096차원 벡터 포함)을 응답으로 돌려받지 않음
+    # supabase-py는 동기 HTTP 호출이므로 스레드에서 실행 (임베딩 요청과 동시에 진행)
+    try:
+        rows = [row for _, row in batch]
+        await asyncio.to_thread(
+            client.table("documents").insert(rows, returning="minimal").execute
+        )
+        saved.update(filename for filename, _ in batch)
+
+    except Exception as e:
+        logger.warning(f"배치 저장 실패 ({len(batch)}행), 개별 저장 재시도: {e}")
+        for filename, row in batch:
+            try:
+                await asyncio.to_thread(
+                    client.table("documents").insert(row, returning="minimal").execute
+                )
+                saved[filename] += 1
+            except Exception as e:
+                logger.error(f"{filename} 청크 {row['metadata']['chunk_index']} 저장 실패: {e}")
 
-            saved_count += 1
+    return saved
 
-            if (i + 1) % 10 == 0:
-                logger.info(f"진행 중: {i + 1}/{len(chunks)}")
 
+def _log_file_result(filename: str, status: str, saved: int, chunks: int) -> None:
+    """파일 하나의 적재 결과를 로깅"""
+    logger.info("{} {}: {}/{} 청크", STATUS_EMOJI.get(status, "❓"), filename, saved, chunks)
+
+
+async def save_worker(client: Client, queue: asyncio.Queue) -> Counter[str]:
+    """
+    파일별로 만들어진 행을 모아서 SAVE_BATCH_SIZE 단위로 저장합니다.
+
+    파일마다 따로 insert하지 않고 여러 파일의 행을 한 배치로 묶으므로
+    HTTP 왕복 수가 파일 수가 아니라 전체 청크 수 / 배치 크기가 됩니다.
+    파일의 행을 받으면 그 파일의 예전 청크를 먼저 삭제하고,
+    마지막 행까지 저장되면 그 파일의 결과를 바로 로깅합니다.
+    queue에서 None을 받으면 남은 행을 저장하고 종료합니다.
+
+    저장 중 오류는 파일/배치 단위로 로깅하고 계속 진행합니다.
+    (이 워커가 멈추면 save_queue가 비워지지 않아 embed_worker가 put에서 멈추고
+     파이프라인 전체가 끝나지 않으므로, 예외가 워커 밖으로 나가지 않게 함)
+
+    Args:
+        client: Supabase 클라이언트
+        queue: (파일명, status, 행 목록)을 받는 큐
+
+    Returns:
+        Counter[str]: 파일별 저장된 레코드 수
+    """
+    saved: Counter[str] = Counter()
+    pending: list[tuple[str, dict]] = []
+
+    # 파일별 (status, 전체 청크 수) / 아직 저장하지 않은 청크 수
+    file_info: dict[str, tuple[str, int]] = {}
+    remaining: Counter[str] = Counter()
+
+    async def flush(batch: list[tuple[str, dict]]) -> None:
+        try:
+            saved.update(await save_to_supabase(client, batch))
+        except Exception:
+            logger.exception("배치 저장 중 예상하지 못한 오류 ({}행)", len(batch))
+
+        for filename, count in Counter(filename for filename, _ in batch).items():
+            remaining[filename] -= count
+            if remaining[filename] == 0:
+                status, chunks = file_info[filename]
+                _log_file_result(filename, status, saved[filename], chunks)
+
+    while (item := await queue.get()) is not None:
+        filename, status, rows = item
+
+        # 내용이 바뀐 문서는 예전 청크를 먼저 지움 (이 파일의 행이 저장되기 전)
+        # 지우지 못하면 새 행을 넣을 때 중복되므로 이 파일은 저장하지 않음
+        try:
+            await delete_file_documents(client, [filename])
         except Exception as e:
-            logger.error(f"청크 {i} 저장 실패: {e}")
+            logger.error("❌ {} 기존 청크 삭제 실패, 저장 건너뜀: {}", filename, e)
+            continue
 
-    logger.info(f"Supabase 저장 완료: {saved_count}개")
+        file_info[filename] = (status, len(rows))
+        remaining[filename] = len(rows)
+        pending.extend((filename, row) for row in rows)
 
-    return saved_count
+        # 청크가 없는 문서는 저장할 것이 없으므로 바로 완료
+        if not rows:
+            _log_file_result(filename, status, 0, 0)
 
+        while len(pending) >= SAVE_BATCH_SIZE:
+            batch, pending = pending[:SAVE_BATCH_SIZE], pending[SAVE_BATCH_SIZE:]
+            await flush(batch)
+            logger.info("저장 진행 중: {}개", saved.total())
 
-async def ingest_document(file_path: str) -> dict:
+    if pending:
+        await flush(pending)
+
+    logger.info(f"Supabase 저장 완료: {saved.total()}개")
+
+    return saved
+
+
+async def load_document(file_path: str) -> dict:
     """
-    단일 문서를 처리하여 벡터 DB에 저장합니다.
+    단일 문서를 로드하고 메타데이터 추출/청킹까지 수행합니다. (파이프라인 1단계)
 
     Args:
         file_path: 문서 파일 경로
 
     Returns:
-        dict: 처리 결과 (chunks, saved, metadata)
+        dict: 로드 결과 (file, sha256, chunks, metadata)
     """
-    path = Path(file_path)
-
-    if not path.exists():
-        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+    path = anyio.Path(file_path)
 
     logger.info(f"문서 로드: {path.name}")
 
     # 1. 문서 로드
-    content = path.read_text(encoding="utf-8")
+    # 파일 읽기는 스레드에서 실행 (다른 파일의 임베딩/저장 요청을 막지 않음)
+    # 존재 확인을 따로 하지 않고 읽기 실패로 판단해서 스레드 왕복을 한 번으로 줄임
+    try:
+        content = await path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}") from None
 
     # 2. 메타데이터 추출
     metadata = extract_metadata(content)
@@ -263,20 +593,185 @@ async def ingest_document(file_path: str) -> dict:
     # 3. 청킹
     chunks = chunk_document(content)
 
-    # 4. 임베딩
-    vectors = await embed_chunks(chunks)
-
-    # 5. 저장
-    saved_count = await save_to_supabase(chunks, vectors, metadata)
-
     return {
         "file": path.name,
-        "chunks": len(chunks),
-        "saved": saved_count,
+        "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        "chunks": chunks,
         "metadata": metadata
     }
 
 
+def _is_transient(error: BaseException) -> bool:
+    """
+    재시도하면 성공할 수 있는 일시적 오류인지 판단합니다.
+
+    - HTTP 429(rate limit) / 5xx 응답
+    - 연결 끊김, 타임아웃 등 네트워크 오류
+    - 상태 코드가 없는 SDK 예외는 메시지로 rate limit/quota 여부 확인
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+    if status_code in _TRANSIENT_STATUS_CODES:
+        return True
+
+    message = str(error).lower()
+    return any(text in message for text in _TRANSIENT_MESSAGES)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """재시도 대기 전에 실패 원인과 대기 시간을 로깅"""
+    logger.warning(
+        "일시적 오류로 재시도 ({}/{}), {:.1f}초 대기: {}",
+        retry_state.attempt_number,
+        INGEST_MAX_ATTEMPTS,
+        retry_state.next_action.sleep,
+        retry_state.outcome.exception(),
+    )
+
+
+# 설정 오류(ValueError) 등은 재시도하지 않고 바로 실패
+# 임베딩 단계는 저장하지 않으므로(save_worker가 저장) 재시도해도 중복 저장되지 않음
+@retry(
+    retry=retry_if_exception(_is_transient),
+    wait=wait_exponential(min=1, max=30),
+    stop=stop_after_attempt(INGEST_MAX_ATTEMPTS),
+    before_sleep=_log_retry,
+    reraise=True,
+)
+async def embed_document(document: dict) -> list[dict]:
+    """
+    문서의 청크를 임베딩해서 저장할 행을 만듭니다. (파이프라인 2단계)
+
+    일시적 API 오류가 나면 exponential backoff로 재시도합니다.
+
+    Args:
+        document: load_document 결과
+
+    Returns:
+        list[dict]: documents 테이블에 저장할 행 목록
+    """
+    vectors = await embed_chunks(document["chunks"])
+
+    # 다음 실행에서 변경 여부를 판단할 수 있도록 원본 파일명과 내용 해시를 함께 저장
+    metadata = {
+        **document["metadata"],
+        "source_file": document["file"],
+        "source_sha256": document["sha256"],
+    }
+    return build_rows(document["chunks"], vectors, metadata)
+
+
+async def parse_worker(
+    file_paths: list[Path],
+    parse_queue: asyncio.Queue,
+    outcomes: dict,
+    num_embed_workers: int,
+    indexed: dict[str, str | None],
+) -> None:
+    """
+    파일을 순서대로 로드해서 parse_queue로 보냅니다. (실패한 파일은 바로 로깅)
+
+    이미 같은 내용(sha256)으로 적재된 파일은 임베딩/저장 없이 건너뜁니다.
+    끝나면 embed_worker 수만큼 종료 신호(None)를 보냅니다.
+    """
+    for file_path in file_paths:
+        try:
+            document = await load_document(str(file_path))
+        except Exception as e:
+            logger.error("❌ {} 로드 실패: {}", file_path.name, e)
+            outcomes[file_path.name] = e
+            continue
+
+        filename = document["file"]
+        if indexed.get(filename) == document["sha256"]:
+            logger.info("⏭️ {}: 변경 없음, 건너뜀", filename)
+            outcomes[filename] = {
+                "chunks": 0,
+                "status": document["metadata"].get("status", "unknown"),
+                "cached": True,
+            }
+            continue
+
+        await parse_queue.put(document)
+
+    for _ in range(num_embed_workers):
+        await parse_queue.put(None)
+
+
+async def embed_worker(
+    parse_queue: asyncio.Queue,
+    save_queue: asyncio.Queue,
+    outcomes: dict,
+) -> None:
+    """
+    parse_queue의 문서를 임베딩해서 (파일명, status, 행 목록)을 save_queue로 보냅니다.
+
+    실패한 문서는 바로 로깅하고 outcomes에 예외를 기록한 뒤 다음 문서를 처리합니다.
+    """
+    while (document := await parse_queue.get()) is not None:
+        filename = document["file"]
+        try:
+            rows = await embed_document(document)
+        except Exception as e:
+            logger.error("❌ {} 임베딩 실패: {}", filename, e)
+            outcomes[filename] = e
+            continue
+
+        # 요약에 필요한 값만 남기고 청크/메타데이터는 보관하지 않음
+        # status는 검증/요약에서 여러 번 읽으므로 결과를 만들 때 한 번만 꺼내 둠
+        status = document["metadata"].get("status", "unknown")
+        outcomes[filename] = {
+            "chunks": len(rows),
+            "status": status,
+        }
+        await save_queue.put((filename, status, rows))
+
+
+async def run_pipeline(
+    client: Client,
+    file_paths: list[Path],
+    indexed: dict[str, str | None],
+) -> tuple[dict, Counter[str]]:
+    """
+    로드 -> 임베딩 -> 저장 3단계를 큐로 연결해서 동시에 실행합니다.
+
+    파일 N+1을 로드하는 동안 파일 N을 임베딩하고, 앞서 임베딩된 행을 저장하므로
+    전체 시간이 단계별 시간의 합이 아니라 가장 느린 단계(임베딩)에 가까워집니다.
+    큐 크기를 제한해서 앞 단계가 너무 앞서 나가 메모리에 쌓이지 않게 합니다.
+
+    Args:
+        client: Supabase 클라이언트
+        file_paths: 적재할 파일 경로 목록
+        indexed: 이미 적재된 파일명 -> 내용 sha256 (같으면 건너뜀)
+
+    Returns:
+        tuple: (파일명 -> {chunks, status, cached} 또는 예외, 파일별 저장된 레코드 수)
+    """
+    parse_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    save_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    outcomes: dict = {}
+
+    saver = asyncio.create_task(save_worker(client, save_queue))
+    embedders = [
+        asyncio.create_task(embed_worker(parse_queue, save_queue, outcomes))
+        for _ in range(INGEST_CONCURRENCY)
+    ]
+
+    await parse_worker(file_paths, parse_queue, outcomes, len(embedders), indexed)
+    await asyncio.gather(*embedders)
+
+    # 모든 행을 보냈으면 종료 신호(None)를 보내고 남은 행 저장을 기다림
+    await save_queue.put(None)
+    saved_by_file = await saver
+
+    return outcomes, saved_by_file
+
+
 def parse_args():
     """명령줄 인자를 파싱합니다."""
     parser = argparse.ArgumentParser(
@@ -290,9 +785,12 @@ def parse_args():
   # v2.5 (active)만 적재 (Distractor 제외)
   uv run python data/scripts/ingest_rag.py --active-only
 
+  # 기존 데이터를 모두 삭제하고 처음부터 다시 적재
+  uv run python data/scripts/ingest_rag.py --full
+
 멱등성:
   몇 번을 실행해도 동일한 결과를 보장합니다.
-  실행 시 기존 데이터를 모두 삭제하고 새로 적재합니다.
+  내용(sha256)이 바뀌지 않은 문서는 건너뛰고, 바뀐 문서만 다시 적재합니다.
 
 Distractor 설명:
   v1.0 (deprecated)은 RAG 메타데이터 필터링 시연용 "방해 문서"입니다.
@@ -304,6 +802,11 @@ Distractor 설명:
         action="store_true",
         help="v2.5 (active) 문서만 적재 (Distractor 제외)"
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="기존 데이터를 모두 삭제하고 모든 문서를 다시 적재"
+    )
     return parser.parse_args()
 
 
@@ -313,12 +816,13 @@ async def main():
 
     기본: v2.5 (active) + v1.0 (deprecated) 모두 적재
     --active-only: v2.5만 적재 (Distractor 제외)
+    --full: 기존 데이터를 모두 삭제하고 다시 적재 (변경 없는 문서도 다시 임베딩)
     """
     args = parse_args()
 
-    logger.info("=" * 60)
+    logger.info(SEP_EQ)
     logger.info("RAG 데이터 Ingestion (멱등성 보장)")
-    logger.info("=" * 60)
+    logger.info(SEP_EQ)
 
     # 프로젝트 루트의 data 폴더 (현재 스크립트 위치: data/scripts/ingest_rag.py)
     # parent=scripts, parent.parent=data
@@ -346,41 +850,66 @@ async def main():
             return
 
     try:
-        # 1. 기존 데이터 삭제 (멱등성 보장)
-        logger.info("🔄 Step 1: 기존 데이터 정리")
-        await truncate_documents()
-
-        # 2. 문서 적재
+        client = create_supabase_client()
+
+        # 1. 기존 데이터 정리 (멱등성 보장)
+        if args.full:
+            logger.info("🔄 Step 1: 기존 데이터 정리 (--full)")
+            await truncate_documents(client)
+            indexed = {}
+        else:
+            logger.info("🔄 Step 1: 적재된 문서 확인")
+            indexed = await fetch_indexed_files(client)
+            await prune_documents(client, {filename for filename, _, _ in files_to_ingest}, indexed)
+
+        # 2. 문서 적재 (로드 -> 임베딩 -> 저장 파이프라인)
         logger.info("\n🔄 Step 2: 문서 적재")
-        results = []
+        for filename, _, description in files_to_ingest:
+            logger.info(f"📄 {filename} ({description})")
+
+        outcomes, saved_by_file = await run_pipeline(
+            client, [data_dir / filename for filename, _, _ in files_to_ingest], indexed
+        )
+
+        # 최종 결과 : 파일별 결과는 저장이 끝나는 대로 로깅했으므로 검증과 합계만 출력
+        # 파일별 결과를 목록에 모아두지 않고 합계만 누적
+        logger.info(HEADER)
+        logger.info("Ingestion 결과 요약")
+        logger.info(SEP_EQ)
+
         total_chunks = 0
         total_saved = 0
+        failed_files = 0
+        skipped_files = 0
 
-        for filename, expected_status, description in files_to_ingest:
-            file_path = data_dir / filename
-            logger.info(f"\n📄 {filename} ({description})")
-            logger.info("-" * 40)
+        for filename, expected_status, _ in files_to_ingest:
+            result = outcomes.pop(filename)
+
+            # 한 파일이 실패해도 나머지 파일의 결과는 집계
+            if isinstance(result, Exception):
+                failed_files += 1
+                continue
+
+            if result.get("cached"):
+                skipped_files += 1
 
-            result = await ingest_document(str(file_path))
-            results.append(result)
             total_chunks += result["chunks"]
-            total_saved += result["saved"]
+            total_saved += saved_by_file[filename]
 
             # 메타데이터 검증
-            actual_status = result["metadata"].get("status", "unknown")
-            if actual_status != expected_status:
-                logger.warning(f"⚠️ 메타데이터 불일치: 예상={expected_status}, 실제={actual_status}")
-
-        # 최종 결과
-        logger.info("\n" + "=" * 60)
-        logger.info("Ingestion 결과 요약")
-        logger.info("=" * 60)
-        for result in results:
-            status_emoji = "✅" if result["metadata"].get("status") == "active" else "📦"
-            logger.info(f"{status_emoji} {result['file']}: {result['saved']}/{result['chunks']} 청크")
-        logger.info("-" * 40)
-        logger.info(f"총 청크: {total_chunks}개, 저장: {total_saved}개")
-        logger.info("=" * 60)
+            # 포맷 인자를 따로 넘겨서 WARNING이 꺼져 있으면 loguru가 문자열을 만들지 않게 함
+            if result["status"] != expected_status:
+                logger.warning("⚠️ {} 메타데이터 불일치: 예상={}, 실제={}", filename, expected_status, result["status"])
+
+        logger.info(
+            "파일: {}개 적재, {}개 변경 없음, {}개 실패",
+            len(files_to_ingest) - failed_files - skipped_files,
+            skipped_files,
+            failed_files,
+        )
+        logger.info(SEP_DASH)
+        logger.info("총 청크: {}개, 저장: {}개", total_chunks, total_saved)
+        logger.info(SEP_EQ)
 
         logger.success("RAG Ingestion 완료!")
 
@@ -391,9 +920,8 @@ async def main():
         logger.info("3. Supabase SQL Editor에서 data/schema.sql 실행")
 
     except Exception as e:
-        logger.error(f"Ingestion 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        # 스택 트레이스도 stderr에 따로 출력하지 않고 loguru sink로 함께 기록
+        logger.exception("Ingestion 실패: {}", e)
 
 
 if __name__ == "__main__":
@@ -49,11 +49,29 @@ CREATE INDEX IF NOT EXISTS documents_metadata_idx
 ON documents
 USING gin (metadata);
 
--- 검색 함수 생성 (메타데이터 필터링 지원)
+-- 원본 파일명 인덱스 (ingest_rag.py가 파일 단위로 청크를 조회/삭제할 때 사용)
+CREATE INDEX IF NOT EXISTS documents_source_file_idx
+ON documents ((metadata->>'source_file'));
+
+-- 벡터 검색 인덱스 (HNSW)
+-- pgvector HNSW 인덱스는 vector 최대 2,000차원(halfvec 4,000차원)까지만 지원
+-- 4096차원이므로 binary quantization(bit) 표현식에 인덱스를 만들고,
+-- 후보를 넉넉히 뽑은 뒤 원본 벡터의 코사인 거리로 다시 정렬(re-rank)
+CREATE INDEX IF NOT EXISTS documents_embedding_hnsw
+ON documents
+USING hnsw ((binary_quantize(embedding)::bit(4096)) bit_hamming_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- 이전 시그니처(ef_search 없음)가 남아 있으면 RPC 호출이 모호해지므로 삭제
+DROP FUNCTION IF EXISTS match_documents(VECTOR(4096), INT, TEXT);
+
+-- 검색 함수 생성 (메타데이터 필터링 + HNSW ef_search 지원)
+-- ef_search: 클수록 recall이 높고 느림 (기본값 40)
 CREATE OR REPLACE FUNCTION match_documents(
     query_embedding VECTOR(4096),
     match_count INT DEFAULT 3,
-    filter_status TEXT DEFAULT 'active'
+    filter_status TEXT DEFAULT 'active',
+    ef_search INT DEFAULT 40
 )
 RETURNS TABLE(
     id BIGINT,
@@ -61,21 +79,69 @@ RETURNS TABLE(
     metadata JSONB,
     similarity FLOAT
 )
-LANGUAGE sql STABLE
+LANGUAGE plpgsql
 AS $$
+BEGIN
+    -- 현재 트랜잭션에서만 적용
+    PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+    -- 메타데이터 필터로 후보가 부족해지지 않도록 iterative scan (pgvector 0.8+)
+    PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+
+    RETURN QUERY
     SELECT
-        id,
-        content,
-        metadata,
-        1 - (embedding <=> query_embedding) AS similarity
-    FROM documents
-    WHERE
-        CASE
-            WHEN filter_status = 'all' THEN TRUE
-            ELSE metadata->>'status' = filter_status
-        END
-    ORDER BY embedding <=> query_embedding
+        c.id,
+        c.content,
+        c.metadata,
+        1 - (c.embedding <=> query_embedding) AS similarity
+    FROM (
+        SELECT d.id, d.content, d.metadata, d.embedding
+        FROM documents d
+        WHERE
+            CASE
+                WHEN filter_status = 'all' THEN TRUE
+                ELSE d.metadata->>'status' = filter_status
+            END
+        ORDER BY binary_quantize(d.embedding)::bit(4096) <~> binary_quantize(query_embedding)
+        LIMIT GREATEST(ef_search, match_count * 10)
+    ) c
+    ORDER BY c.embedding <=> query_embedding
     LIMIT match_count;
+END;
+$$;
+
+-- 여러 쿼리 배치 검색 함수 (RPC 한 번으로 N개 쿼리 검색)
+-- query_embeddings: 임베딩 벡터 배열 (JSON) ex) [[0.1, ...], [0.2, ...]]
+-- query_idx: query_embeddings에서의 위치 (0부터 시작)
+CREATE OR REPLACE FUNCTION match_documents_batch(
+    query_embeddings JSONB,
+    match_count INT DEFAULT 3,
+    filter_status TEXT DEFAULT 'active',
+    ef_search INT DEFAULT 40
+)
+RETURNS TABLE(
+    query_idx INT,
+    id BIGINT,
+    content TEXT,
+    metadata JSONB,
+    similarity FLOAT
+)
+LANGUAGE sql
+AS $$
+    SELECT
+        (q.idx - 1)::INT AS query_idx,
+        m.id,
+        m.content,
+        m.metadata,
+        m.similarity
+    FROM jsonb_array_elements(query_embeddings) WITH ORDINALITY AS q(embedding, idx)
+    -- 쿼리마다 match_documents로 top-k 검색
+    CROSS JOIN LATERAL match_documents(
+        (q.embedding::text)::VECTOR(4096),
+        match_count,
+        filter_status,
+        ef_search
+    ) AS m
+    ORDER BY query_idx, m.similarity DESC;
 $$;
 
 -- 문서 통계 함수 
@@ -7,10 +7,21 @@ pytest-asyncio를 사용하여 비동기 테스트를 수행합니다.
     uv run pytest tests/test_agent.py -v
 """
 
+import asyncio
+import sqlite3
+
 import pytest
+from langchain_core.runnables.config import var_child_runnable_config
+from langgraph.checkpoint.base import empty_checkpoint
 
+from app.core.batching import BatchingClient
+from app.graph import checkpointer as checkpointer_module
+from app.graph.checkpointer import BoundedMemorySaver
 from app.graph.edges import route_by_intent
 from app.graph.state import LumiState, create_initial_state
+from app.repositories.embedding_cache import EmbeddingDiskCache, dequantize, quantize
+from app.repositories.rag import normalize_query
+from app.schemas.chat import StreamEvent, format_token_sse
 from app.tools.executor import ToolExecutor
 
 
@@ -106,6 +117,84 @@ class TestEdges:
         assert result == "response"
 
 
+class TestRAG:
+    """RAG 관련 테스트"""
+
+    def test_normalize_query(self):
+        """문장부호/공백/대소문자만 다른 쿼리는 같은 캐시 키"""
+        assert normalize_query("마늘 좋아해?") == "마늘 좋아해"
+        assert normalize_query("  마늘  좋아해?! ") == "마늘 좋아해"
+        assert normalize_query("ＭＢＴＩ 뭐야") == normalize_query("mbti 뭐야?")
+
+
+class TestEmbeddingDiskCache:
+    """임베딩 디스크 캐시 테스트"""
+
+    def test_roundtrip_across_instances(self, tmp_path):
+        """저장한 임베딩은 새 인스턴스(재시작)에서도 조회됨"""
+        path = tmp_path / "embeddings.sqlite3"
+        key = EmbeddingDiskCache.make_key("solar-embedding", "마늘 좋아해")
+
+        EmbeddingDiskCache(str(path)).set(key, [0.5, -0.25, 1.0])
+
+        cache = EmbeddingDiskCache(str(path))
+        assert cache.get(key) == pytest.approx([0.5, -0.25, 1.0], abs=1 / 127)
+        assert cache.get(EmbeddingDiskCache.make_key("other-model", "마늘 좋아해")) is None
+
+    def test_prunes_oldest_entries_over_max(self, tmp_path):
+        """max_entries를 넘으면 먼저 저장된 항목부터 삭제"""
+        cache = EmbeddingDiskCache(str(tmp_path / "embeddings.sqlite3"), max_entries=3, prune_every=1)
+        keys = [EmbeddingDiskCache.make_key("solar-embedding", f"q{i}") for i in range(5)]
+        for key in keys:
+            cache.set(key, [1.0, 0.0])
+
+        assert [cache.get(key) is not None for key in keys] == [False, False, True, True, True]
+
+    def test_adds_created_at_to_existing_file(self, tmp_path):
+        """created_at 컬럼이 없던 기존 캐시 파일도 그대로 열리고 조회됨"""
+        path = tmp_path / "embeddings.sqlite3"
+        key = EmbeddingDiskCache.make_key("solar-embedding", "마늘 좋아해")
+        vec, scale = quantize([0.5, -0.5])
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE embeddings_int8 (key BLOB PRIMARY KEY, vec BLOB NOT NULL, scale REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO embeddings_int8 VALUES (?, ?, ?)", (key, vec, scale))
+        conn.commit()
+        conn.close()
+
+        cache = EmbeddingDiskCache(str(path))
+        assert cache.get(key) == pytest.approx([0.5, -0.5], abs=1 / 127)
+
+    def test_quantize_roundtrip_error_bound(self):
+        """int8 양자화는 원소당 1바이트, 복원 오차는 scale/2 이내"""
+        embedding = [0.03, -0.12, 0.5, 0.0, -0.5]
+        data, scale = quantize(embedding)
+
+        assert len(data) == len(embedding)
+        assert dequantize(data, scale) == pytest.approx(embedding, abs=scale / 2 + 1e-6)
+
+    def test_quantize_zero_vector(self):
+        """0 벡터도 0으로 나누지 않고 복원됨"""
+        data, scale = quantize([0.0, 0.0])
+        assert dequantize(data, scale) == [0.0, 0.0]
+
+
+class TestStreamEvent:
+    """SSE 이벤트 직렬화 테스트"""
+
+    def test_to_sse_returns_bytes(self):
+        """None 필드는 빠지고 SSE 프레임 bytes로 직렬화"""
+        sse = StreamEvent(type="thinking", node="router").to_sse()
+        assert sse == b'data: {"type":"thinking","node":"router"}\n\n'
+
+    def test_format_token_sse_matches_to_sse(self):
+        """토큰 fast path는 StreamEvent.to_sse와 같은 bytes를 만들어야 함"""
+        for content in ["안녕", 'say "hi"\n', ""]:
+            expected = StreamEvent(type="token", content=content).to_sse()
+            assert format_token_sse(content) == expected
+
+
 class TestToolExecutor:
     """Tool Executor 테스트"""
 
@@ -140,6 +229,19 @@ class TestToolExecutor:
         assert result["success"] is True
         assert result["data"]["mood"] == "sad"
 
+    @pytest.mark.asyncio
+    async def test_recommend_song_unknown_mood(self, executor):
+        """목록에 없는 mood는 happy 곡을 추천하고 요청한 mood를 그대로 표시"""
+        result = await executor.execute(
+            tool_name="recommend_song",
+            tool_args={"mood": "sleepy"},
+            session_id="test-session",
+        )
+
+        assert result["success"] is True
+        assert result["data"]["mood"] == "sleepy"
+        assert "song" in result["data"]
+
     @pytest.mark.asyncio
     async def test_get_weather(self, executor):
         """날씨 조회 테스트"""
@@ -154,6 +256,26 @@ class TestToolExecutor:
         assert "temperature" in result["data"]
         assert result.get("mock") is True
 
+    @pytest.mark.asyncio
+    async def test_get_weather_returns_copy(self, executor):
+        """반환된 응답을 수정해도 다음 호출 결과는 그대로"""
+        first = await executor.execute(
+            tool_name="get_weather",
+            tool_args={},
+            session_id="test-session",
+        )
+        first["data"]["temperature"] = 99
+        first["success"] = False
+
+        second = await executor.execute(
+            tool_name="get_weather",
+            tool_args={},
+            session_id="test-session",
+        )
+
+        assert second["success"] is True
+        assert second["data"]["temperature"] == 5
+
     @pytest.mark.asyncio
     async def test_unknown_tool(self, executor):
         """알 수 없는 Tool 테스트"""
@@ -198,3 +320,173 @@ class TestToolExecutor:
 
         assert result["success"] is True
         assert "letter_id" in result["data"]
+
+    @pytest.mark.asyncio
+    async def test_execute_many(self, executor):
+        """여러 Tool 동시 실행 테스트 (순서 유지)"""
+        results = await executor.execute_many(
+            calls=[
+                {"name": "get_weather", "args": {}},
+                {"name": "recommend_song", "args": {"mood": "happy"}},
+                {"name": "unknown_tool", "args": {}},
+            ],
+            session_id="test-session",
+        )
+
+        assert len(results) == 3
+        assert "temperature" in results[0]["data"]
+        assert "song" in results[1]["data"]
+        assert results[2]["success"] is False
+
+
+class TestBoundedMemorySaver:
+    """오래된 세션을 정리하는 체크포인터 테스트"""
+
+    @staticmethod
+    def put(saver, thread_id):
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        saver.put(config, empty_checkpoint(), {}, {})
+
+    @staticmethod
+    def has(saver, thread_id):
+        return saver.get_tuple({"configurable": {"thread_id": thread_id}}) is not None
+
+    def test_keeps_only_latest_checkpoint_per_thread(self):
+        """대화가 이어져도 thread의 체크포인트/blob 수는 늘지 않음"""
+        saver = BoundedMemorySaver(ttl_seconds=3600, max_sessions=10)
+        config = {"configurable": {"thread_id": "a", "checkpoint_ns": ""}}
+        sizes = []
+
+        for turn in range(1, 21):
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": [f"turn {turn}"]}
+            checkpoint["channel_versions"] = {"messages": turn}
+            saver.put(config, checkpoint, {}, {"messages": turn})
+            sizes.append(
+                (len(saver.storage["a"][""]), sum(1 for key in saver.blobs if key[0] == "a"))
+            )
+
+        assert set(sizes) == {(1, 1)}
+        latest = saver.get_tuple({"configurable": {"thread_id": "a"}})
+        assert latest.checkpoint["channel_values"] == {"messages": ["turn 20"]}
+
+    def test_evicts_least_recently_used_over_max_sessions(self):
+        """최대 세션 수를 넘으면 가장 오래 쓰지 않은 세션부터 삭제"""
+        saver = BoundedMemorySaver(ttl_seconds=3600, max_sessions=2)
+
+        self.put(saver, "a")
+        self.put(saver, "b")
+        self.put(saver, "a")
+        self.put(saver, "c")
+
+        assert self.has(saver, "a")
+        assert not self.has(saver, "b")
+        assert self.has(saver, "c")
+
+    def test_evicts_idle_sessions_after_ttl(self, monkeypatch):
+        """TTL 동안 저장이 없었던 세션은 다음 저장 때 삭제"""
+        now = [0.0]
+        monkeypatch.setattr(checkpointer_module.time, "monotonic", lambda: now[0])
+        saver = BoundedMemorySaver(ttl_seconds=60, max_sessions=100)
+
+        self.put(saver, "old")
+        now[0] = 30.0
+        self.put(saver, "recent")
+        now[0] = 61.0
+        self.put(saver, "new")
+
+        assert not self.has(saver, "old")
+        assert self.has(saver, "recent")
+        assert self.has(saver, "new")
+
+
+class TestBatchingClient:
+    """LLM 배치 클라이언트 테스트"""
+
+    class FakeRunnable:
+        """abatch 호출을 기록하는 가짜 Runnable"""
+
+        def __init__(self):
+            self.batches = []
+            self.configs = []
+            self.worker_configs = []
+
+        async def abatch(self, inputs, config=None, *, return_exceptions=False):
+            self.batches.append(list(inputs))
+            self.configs.append(config)
+            self.worker_configs.append(var_child_runnable_config.get())
+            return [
+                ValueError("bad") if item == "bad" else item.upper()
+                for item in inputs
+            ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_batch(self):
+        """동시 호출은 하나의 abatch로 묶임"""
+        runnable = self.FakeRunnable()
+        client = BatchingClient(runnable, max_batch_size=8, max_wait_ms=50)
+
+        results = await asyncio.gather(*(client.ainvoke(x) for x in ["a", "b", "c"]))
+
+        assert results == ["A", "B", "C"]
+        assert runnable.batches == [["a", "b", "c"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit_and_errors(self):
+        """배치 크기 제한 + 개별 요청 에러 전달"""
+        runnable = self.FakeRunnable()
+        client = BatchingClient(runnable, max_batch_size=2, max_wait_ms=50)
+
+        results = await asyncio.gather(
+            *(client.ainvoke(x) for x in ["a", "bad", "c"]),
+            return_exceptions=True,
+        )
+
+        assert results[0] == "A"
+        assert isinstance(results[1], ValueError)
+        assert results[2] == "C"
+        assert [len(batch) for batch in runnable.batches] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_batches_run_concurrently(self):
+        """응답을 기다리는 배치가 있어도 다음 배치는 바로 전송됨"""
+
+        class SlowRunnable(self.FakeRunnable):
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.max_in_flight = 0
+
+            async def abatch(self, inputs, config=None, *, return_exceptions=False):
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0.05)
+                self.in_flight -= 1
+                return await super().abatch(inputs, config, return_exceptions=return_exceptions)
+
+        runnable = SlowRunnable()
+        client = BatchingClient(runnable, max_batch_size=1, max_wait_ms=0, max_concurrency=2)
+
+        results = await asyncio.gather(*(client.ainvoke(x) for x in ["a", "b", "c"]))
+
+        assert results == ["A", "B", "C"]
+        assert runnable.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_each_call_keeps_its_own_config(self):
+        """배치 안의 각 항목은 호출한 요청의 config로 실행되고, 워커는 첫 요청의 컨텍스트를 물려받지 않음"""
+        runnable = self.FakeRunnable()
+        client = BatchingClient(runnable, max_batch_size=8, max_wait_ms=50)
+
+        async def call(item, tag):
+            var_child_runnable_config.set({"tags": [tag]})
+            return await client.ainvoke(item)
+
+        await asyncio.gather(call("a", "req-1"), call("b", "req-2"))
+        await call("c", "req-3")
+
+        assert [[config["tags"] for config in configs] for configs in runnable.configs] == [
+            [["req-1"], ["req-2"]],
+            [["req-3"]],
+        ]
+        assert runnable.worker_configs == [None, None]